@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-process pdf2docx vs. chunked multi-process pdf2docx on a text PDF
+Usage: python benchmarks/bench_chunked_layout.py report.pdf [-w 2 4 8] [-c 10 25 50]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf2docx import Converter
+import pdf_to_word_layout as layout
+
+
+def best_of(repeat, run):
+    """Best wall time of repeat calls to run()"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", help="text-based PDF to convert")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1],
+                        help="layout worker counts to try")
+    parser.add_argument("-c", "--chunk-sizes", type=int, nargs="+", default=[layout.DEFAULT_CHUNK_SIZE],
+                        help="pages per worker task to try")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="runs per setting, best time is kept")
+    args = parser.parse_args()
+
+    # pdf2docx logs every page at INFO level
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "out.docx")
+
+        def current():
+            cv = Converter(args.pdf)
+            cv.convert(docx_path, start=0, end=None)
+            cv.close()
+
+        baseline = best_of(args.repeat, current)
+        results = [("current Converter.convert", baseline)]
+
+        for workers in sorted(set(args.workers)):
+            for chunk_size in sorted(set(args.chunk_sizes)):
+                def chunked():
+                    cv = Converter(args.pdf)
+                    layout.convert_layout(cv, args.pdf, docx_path, workers, chunk_size)
+                    cv.close()
+                results.append((f"{workers} workers, chunks of {chunk_size}",
+                                best_of(args.repeat, chunked)))
+
+    print("\nSetting                         | wall time | speedup")
+    for name, seconds in results:
+        print(f"{name:<31} | {seconds:8.2f}s | {baseline / seconds:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
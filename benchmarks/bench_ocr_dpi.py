@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: OCR speed and accuracy across render resolutions and preprocessing modes
+Usage: python benchmarks/bench_ocr_dpi.py corpus/ [-r 150 200 300 adaptive] [-p none gray binary]
+
+Every page of every PDF in the corpus is rendered and OCR'd with each setting.
+Accuracy is the character similarity (0-1) to a reference text: a sidecar file
+next to the PDF (name.txt, pages separated by form feeds) if there is one,
+otherwise the page's own text layer, so born-digital PDFs work as a corpus too.
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_to_word_engine as engine
+import pdf_to_word_ocr as ocr
+import pdf_to_word_preprocess as preprocessing
+import pdf_to_word_source as pdf_source
+
+
+def normalize(text):
+    return " ".join((text or "").split())
+
+
+def load_references(pdf_path, source):
+    """Reference text per page: name.txt split on form feeds, or the text layer"""
+    sidecar = os.path.splitext(pdf_path)[0] + ".txt"
+    if os.path.exists(sidecar):
+        with open(sidecar, encoding="utf-8") as f:
+            pages = f.read().split("\f")
+        return [normalize(t) for t in pages] + [""] * (source.page_count - len(pages))
+    return [normalize(source.extract_text(i)) for i in range(source.page_count)]
+
+
+def run_setting(pdf_files, settings):
+    """OCR every page with settings; returns (pages, seconds, mean accuracy)"""
+    pages = 0
+    seconds = 0.0
+    scores = []
+    for pdf_path in pdf_files:
+        with pdf_source.PDFSource(pdf_path) as source:
+            references = load_references(pdf_path, source)
+            for i in range(source.page_count):
+                if not references[i]:
+                    continue  # nothing to score against (blank page)
+                started = time.perf_counter()
+                text = ocr.ocr_page(source.page(i), i + 1, settings)
+                seconds += time.perf_counter() - started
+                pages += 1
+                scores.append(difflib.SequenceMatcher(None, references[i], normalize(text)).ratio())
+    return pages, seconds, (sum(scores) / len(scores) if scores else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="directory of PDFs (optionally with .txt references)")
+    parser.add_argument("-r", "--resolutions", nargs="+", default=["150", "200", "300", "adaptive"],
+                        help="render resolutions to try; 'adaptive' picks one per page")
+    parser.add_argument("-p", "--preprocess", nargs="+", default=list(preprocessing.PREPROCESS_MODES),
+                        choices=preprocessing.PREPROCESS_MODES, help="preprocessing modes to try")
+    parser.add_argument("--deskew", action="store_true", help="also deskew (gray/binary modes)")
+    parser.add_argument("--lang", help="Tesseract language(s)")
+    args = parser.parse_args()
+
+    pdf_files = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not pdf_files:
+        print(f"❌ No PDFs in {args.corpus}")
+        return 2
+    if not engine.find_tesseract():
+        print("❌ Tesseract not found")
+        return 1
+
+    print(f"\n{'resolution':>10} | {'preprocess':>10} | pages | s/page | accuracy")
+    for resolution in args.resolutions:
+        for mode in args.preprocess:
+            adaptive = resolution == "adaptive"
+            settings = ocr.OCRSettings(
+                resolution=ocr.OCR_RESOLUTION if adaptive else int(resolution),
+                lang=args.lang,
+                adaptive_resolution=adaptive,
+                preprocess=mode,
+                deskew=args.deskew and mode != "none")
+            pages, seconds, accuracy = run_setting(pdf_files, settings)
+            per_page = seconds / pages if pages else 0.0
+            print(f"{resolution:>10} | {mode:>10} | {pages:>5} | {per_page:6.2f} | {accuracy:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial OCR loop vs. process-pool OCR on a scanned PDF
+Usage: python benchmarks/bench_parallel_ocr.py scanned.pdf [-w 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_to_word_engine as engine
+
+
+def time_conversion(pdf_path, workers, repeat):
+    """Best-of-N wall time for an OCR-mode conversion with the given worker count"""
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "out.docx")
+        options = engine.ConversionOptions(ocr_workers=workers)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            if not engine.pdf_to_word_best(pdf_path, docx_path, "ocr", options):
+                raise RuntimeError(f"conversion failed with {workers} worker(s)")
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", help="scanned PDF to convert")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1],
+                        help="OCR worker counts to try (1 = current serial loop)")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="runs per setting, best time is kept")
+    args = parser.parse_args()
+
+    if not engine.find_tesseract():
+        print("❌ Tesseract not found")
+        return 1
+
+    results = []
+    for workers in sorted(set(args.workers)):
+        results.append((workers, time_conversion(args.pdf, workers, args.repeat)))
+
+    serial = dict(results).get(1)
+    print("\nOCR workers | wall time | speedup vs serial")
+    for workers, seconds in results:
+        speedup = f"{serial / seconds:.2f}x" if serial else "-"
+        print(f"{workers:>11} | {seconds:8.2f}s | {speedup}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GUI cold start, from launch until the window is drawn
+Usage: python benchmarks/bench_startup.py [--exe "dist/PDF to Word Converter.exe"] [-n 5] [--cold]
+
+Launches the GUI (from source, or the packaged executable with --exe) with
+PDF_TO_WORD_STARTUP_PROBE set; the app then writes when its window was
+drawn and when the background Tesseract check finished, and quits. Times
+are measured from just before launch, so they include interpreter start-up
+and, for the one-file build, unpacking. Needs a display.
+
+--cold deletes the remembered Tesseract location before every run, to see
+what a first launch (or one after a Tesseract upgrade) costs.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import pdf_to_word_tesseract as tesseract
+
+
+def launch_once(command, timeout):
+    """Start the GUI once; returns (window seconds, Tesseract seconds, probe data)"""
+    fd, probe_file = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.remove(probe_file)
+    env = dict(os.environ, PDF_TO_WORD_STARTUP_PROBE=probe_file)
+    try:
+        started = time.time()
+        proc = subprocess.run(command, env=env, cwd=ROOT_DIR, timeout=timeout,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not os.path.exists(probe_file):
+            raise RuntimeError(f"the app exited (code {proc.returncode}) without reporting "
+                               "its timings; is a display available?")
+        with open(probe_file, encoding="utf-8") as f:
+            probe = json.load(f)
+    finally:
+        if os.path.exists(probe_file):
+            os.remove(probe_file)
+    return probe["ready"] - started, probe["tesseract"] - started, probe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exe", help="packaged executable to launch instead of the source")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="launches to time")
+    parser.add_argument("--cold", action="store_true",
+                        help="forget the cached Tesseract location before every launch")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds to wait per launch")
+    args = parser.parse_args()
+
+    if args.exe:
+        command = [os.path.abspath(args.exe)]
+    else:
+        command = [sys.executable, os.path.join(ROOT_DIR, "pdf_to_word_gui_pro.py")]
+    print(f"🚀 Launching {'packaged' if args.exe else 'source'} GUI {args.repeat} time(s)"
+          f"{', cold Tesseract lookup' if args.cold else ''}")
+
+    windows, lookups = [], []
+    for run in range(1, args.repeat + 1):
+        if args.cold and os.path.exists(tesseract.cache_path()):
+            os.remove(tesseract.cache_path())
+        try:
+            window, lookup, probe = launch_once(command, args.timeout)
+        except (OSError, ValueError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"❌ Launch {run} failed: {e}")
+            return 1
+        windows.append(window)
+        lookups.append(lookup)
+        heavy = ", ".join(probe["heavy_modules"]) or "none"
+        print(f"   Run {run}: window {window:.3f} s, Tesseract check {lookup:.3f} s"
+              f"{'' if probe['tesseract_found'] else ' (not found)'}, heavy modules loaded: {heavy}")
+
+    print(f"\n📊 Window drawn:     median {statistics.median(windows):.3f} s, best {min(windows):.3f} s")
+    print(f"   Tesseract known: median {statistics.median(lookups):.3f} s, best {min(lookups):.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every conversion mode over the synthetic corpus, results as JSON
+Usage: python benchmarks/bench_suite.py [-k text scan] [-s 1 100] [-m auto text ocr] [-o results.json] [--compare baseline.json]
+
+The corpus (see make_corpus.py) is generated on first use. Each conversion
+runs in a fresh Python process, so peak RSS is measured per conversion
+(including OCR/pdf2docx worker processes and Tesseract) and nothing warmed up
+by one run flatters the next. Recorded per document and mode: wall time,
+pages per second, peak RSS and output size.
+
+With --compare, results are checked against an earlier JSON file and the
+exit code is 1 if any conversion got slower (or used more memory) than the
+threshold allows, so the suite can gate changes.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import make_corpus
+import pdf_to_word_engine as engine
+import pdf_to_word_ocr as ocr
+
+RESULTS_VERSION = 1
+
+# Timing differences smaller than this are noise, whatever the percentage
+NOISE_SECONDS = 0.25
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process and its waited-for children"""
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+def run_one(pdf_path, docx_path, mode, ocr_workers, layout_workers, memory_limit_mb=None):
+    """Child-process entry point: convert once and print the measurements as JSON"""
+    engine.find_tesseract()
+    options = engine.ConversionOptions(ocr_workers=ocr_workers, layout_workers=layout_workers,
+                                       memory_limit_mb=memory_limit_mb)
+    started = time.perf_counter()
+    success = engine.pdf_to_word_best(pdf_path, docx_path, mode, options)
+    seconds = time.perf_counter() - started
+    # Stop pooled OCR workers so their memory is counted in RUSAGE_CHILDREN
+    ocr.shutdown_pools()
+    print(json.dumps({
+        "success": bool(success),
+        "seconds": seconds,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "output_bytes": os.path.getsize(docx_path) if success and os.path.exists(docx_path) else 0,
+    }))
+    return 0
+
+
+def measure(pdf_path, mode, args):
+    """Convert pdf_path in a child process; returns its measurements"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, os.path.abspath(__file__), "--run-one", pdf_path,
+               os.path.join(tmp, "out.docx"), mode,
+               str(args.ocr_workers), str(args.layout_workers), str(args.memory_limit_mb or 0)]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8",
+                                  errors="replace", timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            return {"success": False, "seconds": 0.0, "peak_rss_bytes": 0, "output_bytes": 0,
+                    "error": f"timed out after {args.timeout:g}s"}
+    # The measurements are the child's last line; everything before it is conversion logging
+    lines = proc.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, ValueError):
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["no output"]
+        return {"success": False, "seconds": 0.0, "peak_rss_bytes": 0, "output_bytes": 0,
+                "error": tail[0]}
+
+
+def environment():
+    """What the numbers were measured on"""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus_version": make_corpus.CORPUS_VERSION,
+        "tesseract": ocr.tesseract_version(),
+        "packages": {name: engine.package_version(name)
+                     for name in ("pdf2docx", "pdfplumber", "pytesseract", "python-docx",
+                                  "PyMuPDF", "numpy")},
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print changes against a baseline; returns the number of regressions"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["document"], r["mode"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    for result in results:
+        old = baseline.get((result["document"], result["mode"]))
+        if not old or not old["success"] or not result["success"]:
+            continue
+        for metric in ("seconds", "peak_rss_bytes"):
+            if not old[metric]:
+                continue
+            change = result[metric] / old[metric] - 1
+            if metric == "seconds" and result[metric] - old[metric] < NOISE_SECONDS:
+                continue
+            if change > threshold:
+                regressions += 1
+                print(f"   ⚠️ {result['document']} [{result['mode']}] {metric}: "
+                      f"{old[metric]:.4g} -> {result[metric]:.4g} (+{change:.0%})")
+    if not regressions:
+        print("   ✅ No regressions")
+    return regressions
+
+
+def main():
+    if len(sys.argv) == 8 and sys.argv[1] == "--run-one":
+        pdf_path, docx_path, mode, ocr_workers, layout_workers, memory_limit_mb = sys.argv[2:]
+        return run_one(pdf_path, docx_path, mode, int(ocr_workers), int(layout_workers),
+                       int(memory_limit_mb) or None)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(BENCH_DIR, "corpus"),
+                        help="corpus directory, generated if needed (default: benchmarks/corpus)")
+    parser.add_argument("-k", "--kinds", nargs="+", choices=make_corpus.KINDS,
+                        default=list(make_corpus.KINDS))
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=list(make_corpus.SIZES),
+                        help="page counts to run (default: 1 100 1000)")
+    parser.add_argument("-m", "--modes", nargs="+", choices=engine.CONVERSION_MODES,
+                        default=list(engine.CONVERSION_MODES))
+    parser.add_argument("--ocr-workers", type=int, default=1)
+    parser.add_argument("--layout-workers", type=int, default=1)
+    parser.add_argument("--memory-limit-mb", type=int,
+                        help="run with this memory ceiling (see ConversionOptions.memory_limit_mb)")
+    parser.add_argument("-n", "--repeat", type=int, default=1,
+                        help="runs per document and mode; the fastest is kept")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="give up on a single conversion after this many seconds")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--compare", help="earlier results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown/memory growth before --compare fails (default: 0.10)")
+    args = parser.parse_args()
+
+    if not engine.find_tesseract():
+        print("⚠️ Tesseract not found: OCR timings will not be meaningful")
+
+    documents = make_corpus.make_corpus(args.corpus, args.kinds, args.sizes)
+
+    results = []
+    print(f"\n{'document':>16} | {'mode':>4} | pages | wall time | pages/s | peak RSS | output")
+    for pdf_path, kind, pages in documents:
+        for mode in args.modes:
+            runs = [measure(pdf_path, mode, args) for _ in range(max(1, args.repeat))]
+            best = min(runs, key=lambda r: (not r["success"], r["seconds"]))
+            result = {
+                "document": os.path.basename(pdf_path),
+                "kind": kind,
+                "pages": pages,
+                "mode": mode,
+                **best,
+                "pages_per_second": pages / best["seconds"] if best["seconds"] else 0.0,
+            }
+            results.append(result)
+            if result["success"]:
+                print(f"{result['document']:>16} | {mode:>4} | {pages:>5} | {result['seconds']:8.2f}s"
+                      f" | {result['pages_per_second']:7.2f} | {result['peak_rss_bytes'] / 2**20:6.0f}MB"
+                      f" | {result['output_bytes'] / 1024:.0f}KB")
+            else:
+                print(f"{result['document']:>16} | {mode:>4} | {pages:>5} | ❌ {result.get('error', 'failed')}")
+
+    report = {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "settings": {"ocr_workers": args.ocr_workers, "layout_workers": args.layout_workers,
+                     "memory_limit_mb": args.memory_limit_mb, "repeat": args.repeat},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
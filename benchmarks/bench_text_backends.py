@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: page text extraction speed and fidelity per text backend
+Usage: python benchmarks/bench_text_backends.py corpus/ [-b pdfplumber pdfium] [-n 3]
+
+Every page of every PDF in the corpus is extracted with each backend (best of
+-n runs per document). Similarity is the character similarity (0-1) of a
+page's words to pdfplumber's, the default backend, so it shows what the
+faster backends give up; pages without text are skipped.
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_to_word_source as pdf_source
+
+
+def normalize(text):
+    return " ".join((text or "").split())
+
+
+def extract_all(pdf_path, backend):
+    """(seconds, page texts) for one document with one backend"""
+    started = time.perf_counter()
+    with pdf_source.PDFSource(pdf_path, text_backend=backend) as source:
+        texts = []
+        for i in range(source.page_count):
+            texts.append(source.extract_text(i))
+            source.page_done()
+    return time.perf_counter() - started, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", help="directory of PDFs")
+    parser.add_argument("-b", "--backends", nargs="+", default=list(pdf_source.TEXT_BACKENDS),
+                        choices=pdf_source.TEXT_BACKENDS, help="text backends to compare")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="runs per document; the fastest is kept")
+    args = parser.parse_args()
+
+    pdf_files = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    if not pdf_files:
+        print(f"❌ No PDFs in {args.corpus}")
+        return 2
+
+    references = {pdf_path: [normalize(t) for t in extract_all(pdf_path, "pdfplumber")[1]]
+                  for pdf_path in pdf_files}
+
+    print(f"\n{'backend':>10} | pages | ms/page | pages/s | similarity")
+    baseline = None
+    for backend in args.backends:
+        pages = 0
+        seconds = 0.0
+        scores = []
+        for pdf_path in pdf_files:
+            runs = [extract_all(pdf_path, backend) for _ in range(max(1, args.repeat))]
+            best, texts = min(runs, key=lambda run: run[0])
+            seconds += best
+            pages += len(texts)
+            for reference, text in zip(references[pdf_path], texts):
+                if reference:
+                    scores.append(difflib.SequenceMatcher(None, reference, normalize(text)).ratio())
+        rate = pages / seconds if seconds else 0.0
+        similarity = sum(scores) / len(scores) if scores else 0.0
+        speedup = f"  ({rate / baseline:.1f}x)" if baseline else ""
+        baseline = baseline or rate
+        print(f"{backend:>10} | {pages:>5} | {seconds / pages * 1000 if pages else 0:7.2f} | "
+              f"{rate:7.1f} | {similarity:.3f}{speedup}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
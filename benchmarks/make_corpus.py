@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark corpus: deterministic synthetic PDFs for the conversion benchmarks
+Usage: python benchmarks/make_corpus.py [benchmarks/corpus] [-k text scan mixed table] [-s 1 100 1000]
+
+Every document is generated from a fixed seed with PyMuPDF (already installed
+with pdf2docx), so the same command produces byte-identical files on any
+machine and runs from different days are comparable. Kinds:
+
+  text   born-digital pages of paragraphs
+  scan   the same kind of pages, rasterized to image-only pages
+  mixed  alternating scanned pages and text pages with a large photo-like figure
+  table  ruled tables with a heading line per page
+  fax    scanned pages as from a fax or 1-bit scanner: pure black and white
+
+Documents with scanned pages get a name.txt next to them with the text of
+every page (pages separated by form feeds), the reference bench_ocr_dpi.py
+scores OCR against. On fax pages, --preprocess binary must keep the ink:
+an accuracy near 0 there means the page was binarized to blank paper.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+import fitz
+
+# Bump when the generated documents change, so stale corpora are rebuilt
+CORPUS_VERSION = "2"
+
+KINDS = ("text", "scan", "mixed", "table", "fax")
+SIZES = (1, 100, 1000)
+
+# US Letter, in points
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 72
+
+# Text on mixed pages stops here; a figure fills the rest (a third of the page)
+FIGURE_TOP = 380
+
+# Resolution the "scanned" pages are rasterized at
+SCAN_RESOLUTION = 150
+
+WORDS = (
+    "invoice report quarterly revenue account balance customer order shipment "
+    "delivery contract payment schedule period total amount department review "
+    "analysis summary project budget forecast result growth market product "
+    "service region office manager approval signature reference number date "
+    "the of and to in for on with as by from at is are was be this that"
+).split()
+
+
+def sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng):
+    return " ".join(sentence(rng) for _ in range(rng.randint(2, 5)))
+
+
+def draw_text_page(page, rng, page_number, bottom=PAGE_HEIGHT - MARGIN):
+    """Heading plus paragraphs filling the page down to bottom"""
+    page.insert_text((MARGIN, MARGIN), f"Section {page_number}", fontsize=16, fontname="hebo")
+    rect = fitz.Rect(MARGIN, MARGIN + 20, PAGE_WIDTH - MARGIN, bottom)
+    paragraphs = [paragraph(rng) for _ in range(8)]
+    # insert_textbox writes nothing if the text overflows; drop paragraphs until it fits
+    while paragraphs and page.insert_textbox(rect, "\n\n".join(paragraphs),
+                                             fontsize=11, fontname="helv") < 0:
+        paragraphs.pop()
+
+
+def draw_table_page(page, rng, page_number, rows=18, cols=5):
+    """Heading plus a ruled table of short labels and numbers"""
+    page.insert_text((MARGIN, MARGIN), f"Table {page_number}", fontsize=16, fontname="hebo")
+    top = MARGIN + 20
+    width = (PAGE_WIDTH - 2 * MARGIN) / cols
+    height = 28
+    for r in range(rows + 1):
+        y = top + r * height
+        page.draw_line((MARGIN, y), (PAGE_WIDTH - MARGIN, y), width=0.5)
+    for c in range(cols + 1):
+        x = MARGIN + c * width
+        page.draw_line((x, top), (x, top + rows * height), width=0.5)
+    for r in range(rows):
+        for c in range(cols):
+            if r == 0:
+                cell = rng.choice(WORDS).capitalize()
+            elif c == 0:
+                cell = f"{rng.choice(WORDS)} {r}"
+            else:
+                cell = f"{rng.randint(0, 99999):,}.{rng.randint(0, 99):02d}"
+            page.insert_text((MARGIN + c * width + 4, top + r * height + 18), cell,
+                             fontsize=9, fontname="helv")
+
+
+def draw_figure(page, rng, top=FIGURE_TOP):
+    """Photo-like block of random gray levels below top"""
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 120, 60), False)
+    pix.set_rect(pix.irect, (255,))
+    for y in range(0, 60, 6):
+        for x in range(0, 120, 6):
+            pix.set_rect(fitz.IRect(x, y, x + 6, y + 6), (rng.randint(0, 255),))
+    rect = fitz.Rect(MARGIN, top, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+    page.insert_image(rect, pixmap=pix, keep_proportion=False)
+
+
+# Grey levels below this turn black on bi-level (fax) pages, the rest white
+FAX_THRESHOLD = 128
+_FAX_LEVELS = bytes(0 if level < FAX_THRESHOLD else 255 for level in range(256))
+
+
+def add_scanned_page(doc, rng, page_number, bilevel=False):
+    """Rasterize a freshly drawn text page and add it as an image-only page
+
+    Returns the page's text. bilevel reduces the raster to pure black and
+    white, as a fax or 1-bit scan delivers it.
+    """
+    source = fitz.open()
+    draw_text_page(source.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT), rng, page_number)
+    text = source[0].get_text()
+    pix = source[0].get_pixmap(dpi=SCAN_RESOLUTION, colorspace=fitz.csGRAY)
+    source.close()
+    if bilevel:
+        pix = fitz.Pixmap(fitz.csGRAY, pix.width, pix.height,
+                          pix.samples.translate(_FAX_LEVELS), False)
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_image(page.rect, stream=pix.tobytes("png"))
+    return text
+
+
+def build_document(kind, pages, seed):
+    """A fitz.Document of the given kind and page count, and the text of each page"""
+    rng = random.Random(f"{kind}:{pages}:{seed}")
+    doc = fitz.open()
+    texts = []
+    for number in range(1, pages + 1):
+        if kind in ("scan", "fax") or (kind == "mixed" and number % 2 == 0):
+            texts.append(add_scanned_page(doc, rng, number, bilevel=kind == "fax"))
+            continue
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if kind == "table":
+            draw_table_page(page, rng, number)
+        elif kind == "mixed":
+            draw_text_page(page, rng, number, bottom=FIGURE_TOP - 10)
+            draw_figure(page, rng)
+        else:
+            draw_text_page(page, rng, number)
+        texts.append(page.get_text())
+    doc.set_metadata({})
+    return doc, texts
+
+
+def document_name(kind, pages):
+    return f"{kind}_{pages:04d}.pdf"
+
+
+def make_corpus(corpus_dir, kinds=KINDS, sizes=SIZES, seed=0):
+    """Generate missing corpus files; returns [(path, kind, pages)]
+
+    A manifest records the corpus version and seed; when either changes the
+    directory's PDFs are regenerated rather than reused.
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    manifest = {"version": CORPUS_VERSION, "seed": seed}
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            stale = json.load(f) != manifest
+    except (OSError, ValueError):
+        stale = True
+
+    documents = []
+    for kind in kinds:
+        for pages in sizes:
+            path = os.path.join(corpus_dir, document_name(kind, pages))
+            if stale or not os.path.exists(path):
+                print(f"🔹 Generating {os.path.basename(path)}...")
+                doc, texts = build_document(kind, pages, seed)
+                doc.save(path, garbage=4, deflate=True, no_new_id=True)
+                doc.close()
+                if kind in ("scan", "mixed", "fax"):
+                    with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+                        f.write("\f".join(texts))
+            documents.append((path, kind, pages))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"),
+                        help="output directory (default: benchmarks/corpus)")
+    parser.add_argument("-k", "--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="page counts to generate for each kind")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    documents = make_corpus(args.corpus, args.kinds, args.sizes, args.seed)
+    print(f"✅ {len(documents)} document(s) in {args.corpus}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
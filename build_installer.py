@@ -67,6 +67,9 @@ a = Analysis(
         'pdfplumber',
         'pytesseract',
         'pdf2docx',
+        # Imported on the first conversion rather than at startup
+        'pdf_to_word_engine',
+        'pdf_to_word_queue',
         'PIL',
         'docx',
         'tkinter',
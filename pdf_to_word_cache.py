@@ -0,0 +1,170 @@
+"""
+Conversion cache for PDF to Word Converter
+Stores finished DOCX files (or per-page OCR text) on disk, keyed by content and settings
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# Bump when a change to the engine alters the DOCX it produces, so old entries stop matching
+ENGINE_VERSION = "5"
+
+# Default size limits for the document and page-text cache directories
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_PAGE_MAX_BYTES = 256 * 1024 ** 2
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bytes(data):
+    """SHA-256 of a PDF held in memory, the same as hash_file would give for it"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_key(content_hash, settings):
+    """Combine a content hash with the settings that shape the output"""
+    material = json.dumps({"content": content_hash, "engine": ENGINE_VERSION, **settings},
+                          sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded, least-recently-used store of converted documents
+
+    Several processes may share one directory: entries are published with an
+    atomic rename, a hit refreshes the entry's mtime (the LRU clock), and an
+    entry that disappears under a reader is simply treated as a miss.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, suffix=".docx"):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        # Running estimate of the directory size, so small writes don't rescan it
+        self._approx_size = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + self.suffix)
+
+    def fetch(self, key, dest_path):
+        """Copy the entry for key to dest_path; returns False on a miss"""
+        entry = self._entry_path(key)
+        try:
+            shutil.copyfile(entry, dest_path)
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def read(self, key):
+        """Bytes stored under key, or None on a miss"""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def store(self, key, src_path):
+        """Add the file at src_path to the cache under key"""
+        with open(src_path, "rb") as src:
+            self._publish(key, lambda tmp: shutil.copyfileobj(src, tmp))
+
+    def write(self, key, data):
+        """Add bytes to the cache under key"""
+        self._publish(key, lambda tmp: tmp.write(data))
+
+    def _publish(self, key, fill):
+        """Write an entry through a temp file and rename it into place"""
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(entry))
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                fill(tmp)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, entry)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.stores += 1
+
+        if self._approx_size is None:
+            self._approx_size = self.size()
+        else:
+            self._approx_size += size
+        if self._approx_size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """(mtime, size, path) for every published entry"""
+        entries = []
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.startswith(".tmp-") or not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def size(self):
+        """Total bytes held by the cache"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass  # another process got there first
+            except OSError:
+                continue  # open elsewhere (Windows); try the next one
+            total -= size
+        self._approx_size = total
+
+    def stats(self):
+        """Counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes": self.size(),
+        }
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Batch command-line interface for PDF to Word Converter
+Converts many PDFs in parallel across a pool of worker processes
+"""
+
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fitz  # PyMuPDF, installed with pdf2docx
+import pdf_to_word_cache as cache_store
+import pdf_to_word_engine as engine
+import pdf_to_word_layout as layout
+import pdf_to_word_metrics as telemetry
+import pdf_to_word_ocr as ocr
+import pdf_to_word_preprocess as preprocessing
+import pdf_to_word_source as pdf_source
+import pdf_to_word_triage as triage
+
+
+def collect_inputs(sources, recursive=False):
+    """Expand files, glob patterns and directories into a sorted list of PDFs"""
+    found = []
+    for source in sources:
+        if os.path.isdir(source):
+            pattern = os.path.join(source, "**", "*") if recursive else os.path.join(source, "*")
+            # glob is case-sensitive on Linux/macOS, so match the extension
+            # below rather than in the pattern (.pdf, .PDF, .Pdf, ...)
+            matches = glob.glob(pattern, recursive=recursive)
+        elif glob.has_magic(source):
+            matches = glob.glob(source, recursive=recursive)
+        else:
+            matches = [source]
+
+        for path in matches:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() == ".pdf":
+                found.append(os.path.abspath(path))
+            elif not glob.has_magic(source) and not os.path.isdir(source):
+                print(f"⚠️ Skipping {path}: not an existing PDF file")
+
+    # Drop duplicates while keeping a stable order
+    return sorted(set(found))
+
+
+def count_pages(pdf_path):
+    """Return the number of pages in a PDF, or 0 if it can't be read"""
+    try:
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    except Exception:
+        return 0
+
+
+# Result and page-text caches of the current worker process, if enabled
+_worker_cache = None
+_worker_page_cache = None
+
+
+def init_worker(cache_dir=None, cache_max_bytes=None, page_cache_dir=None,
+                page_cache_max_bytes=None):
+    """Per-process setup: point pytesseract at a working Tesseract, open the caches"""
+    global _worker_cache, _worker_page_cache
+    engine.find_tesseract()
+    if cache_dir:
+        _worker_cache = cache_store.ConversionCache(cache_dir, cache_max_bytes)
+    if page_cache_dir:
+        _worker_page_cache = cache_store.ConversionCache(page_cache_dir, page_cache_max_bytes,
+                                                         suffix=".txt")
+
+
+def convert_job(pdf_path, docx_path, conversion_mode, options):
+    """Convert one file inside a worker process and report how it went"""
+    metrics = telemetry.JobMetrics(pdf_path, conversion_mode)
+    started = time.perf_counter()
+    hits_before = _worker_cache.hits if _worker_cache else 0
+    page_before = (_worker_page_cache.hits, _worker_page_cache.misses) if _worker_page_cache else (0, 0)
+    try:
+        success = engine.pdf_to_word_best(pdf_path, docx_path, conversion_mode, options,
+                                          _worker_cache, _worker_page_cache, metrics)
+        error = None if success else metrics.error
+    except Exception as e:
+        success = False
+        error = metrics.error = str(e)
+        metrics.finish(False)
+    elapsed = time.perf_counter() - started
+    cached = None
+    if _worker_cache:
+        cached = "hit" if _worker_cache.hits > hits_before else "miss"
+    page_hits = page_misses = 0
+    if _worker_page_cache:
+        page_hits = _worker_page_cache.hits - page_before[0]
+        page_misses = _worker_page_cache.misses - page_before[1]
+    return {
+        "input": pdf_path,
+        "output": docx_path,
+        "success": success,
+        "error": error,
+        "seconds": elapsed,
+        "pages": count_pages(pdf_path),
+        "cache": cached,
+        "page_cache_hits": page_hits,
+        "page_cache_misses": page_misses,
+        "metrics": metrics.as_dict(),
+    }
+
+
+def print_triage(pdf_files):
+    """Show how Auto mode would route each page, without converting anything"""
+    for pdf_path in pdf_files:
+        print(f"📄 {pdf_path}")
+        try:
+            pages = triage.triage_pages(pdf_path)
+        except Exception as e:
+            print(f"   ❌ Could not read: {e}")
+            continue
+        for p in pages:
+            print(f"   Page {p.index+1:>4}: {p.kind:<8} -> {p.route:<6} ({p.reason})")
+
+
+def print_summary(results, wall_time, workers):
+    """Print totals and throughput for a finished batch"""
+    converted = [r for r in results if r["success"]]
+    failed = [r for r in results if not r["success"]]
+    pages = sum(r["pages"] for r in converted)
+    wall_time = max(wall_time, 1e-9)
+
+    print("\n" + "=" * 50)
+    print("📊 Batch summary")
+    print(f"   Files:      {len(converted)} converted, {len(failed)} failed, {len(results)} total")
+    print(f"   Pages:      {pages}")
+    print(f"   Workers:    {workers}")
+    print(f"   Wall time:  {wall_time:.2f} s")
+    print(f"   Throughput: {len(converted) / wall_time:.2f} files/s, {pages / wall_time:.2f} pages/s")
+    lookups = [r["cache"] for r in results if r["cache"]]
+    if lookups:
+        hits = lookups.count("hit")
+        print(f"   Cache:      {hits} hit(s), {len(lookups) - hits} miss(es), "
+              f"{hits / len(lookups):.0%} hit rate")
+    page_hits = sum(r["page_cache_hits"] for r in results)
+    page_lookups = page_hits + sum(r["page_cache_misses"] for r in results)
+    if page_lookups:
+        print(f"   Page cache: {page_hits} of {page_lookups} OCR page(s) reused, "
+              f"{page_hits / page_lookups:.0%} hit rate")
+    stages = {}
+    for r in results:
+        for stage, seconds in r["metrics"]["stages"].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    if stages:
+        hot = sorted(stages.items(), key=lambda item: -item[1])
+        print("   Stages:     " + ", ".join(f"{stage} {seconds:.2f} s" for stage, seconds in hot))
+    peaks = [r["metrics"]["peak_rss_bytes"] for r in results if r["metrics"]["peak_rss_bytes"]]
+    if peaks:
+        print(f"   Memory:     {max(peaks) / 2**20:.0f} MB peak RSS (largest job)")
+    skipped = {}
+    for r in results:
+        for reason, count in r["metrics"]["skipped_pages"].items():
+            skipped[reason] = skipped.get(reason, 0) + count
+    if skipped:
+        print(f"   Skipped:    {skipped.get('blank', 0)} blank and {skipped.get('duplicate', 0)} "
+              f"duplicate page(s) without OCR")
+    incremental = {}
+    for r in results:
+        for result, count in (r["metrics"]["incremental"] or {}).items():
+            incremental[result] = incremental.get(result, 0) + count
+    if incremental:
+        print(f"   Incremental: {incremental['reused']} page(s) reused, "
+              f"{incremental['recomputed']} recomputed")
+    failed_pages = sum(1 for r in results for p in r["metrics"]["pages"] if p["failed"])
+    if failed_pages:
+        print(f"   ⚠️ {failed_pages} page(s) could not be OCR'd")
+    for r in failed:
+        reason = f": {r['error']}" if r["error"] else ""
+        print(f"   ❌ {r['input']}{reason}")
+    print("=" * 50)
+
+
+def add_conversion_arguments(parser):
+    """Options shared by every front end that runs conversions in worker processes"""
+    parser.add_argument("-m", "--mode", choices=engine.CONVERSION_MODES, default="auto",
+                        help="conversion mode (default: auto)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--ocr-workers", type=int, default=1,
+                        help="processes used to OCR the pages of each file (default: 1)")
+    parser.add_argument("--layout-workers", type=int, default=1,
+                        help="processes used by pdf2docx for the pages of each file (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=layout.DEFAULT_CHUNK_SIZE,
+                        help="pages per pdf2docx worker task (default: %(default)s)")
+    parser.add_argument("--text-backend", choices=pdf_source.TEXT_BACKENDS, default="pdfplumber",
+                        help="page text extraction in OCR mode: pdfplumber for fidelity or "
+                             "pdfium for throughput (default: %(default)s)")
+    parser.add_argument("--ocr-lang",
+                        help="Tesseract language(s), e.g. eng or eng+deu")
+    parser.add_argument("--ocr-backend", choices=ocr.OCR_BACKENDS, default="auto",
+                        help="resident tesserocr engine or one Tesseract process per page "
+                             "(default: auto, tesserocr when installed)")
+    parser.add_argument("--ocr-dpi", type=int, default=ocr.OCR_RESOLUTION,
+                        help="resolution scanned pages are rendered at (default: %(default)s)")
+    parser.add_argument("--adaptive-dpi", action="store_true",
+                        help="pick the OCR resolution per page from page and text size")
+    parser.add_argument("--preprocess", choices=preprocessing.PREPROCESS_MODES, default="none",
+                        help="clean up page images before OCR (default: none)")
+    parser.add_argument("--deskew", action="store_true",
+                        help="straighten slightly rotated scans (needs --preprocess gray/binary)")
+    parser.add_argument("--spill-rasters", action="store_true",
+                        help="park page images in a private temp dir instead of memory")
+    parser.add_argument("--ocr-images", action="store_true",
+                        help="also OCR the images on pages that have text (figures, stamps, "
+                             "signatures) and merge them in; OCR mode")
+    parser.add_argument("--blank-page-ink", type=float, default=0.0, metavar="FRACTION",
+                        help="skip OCR for scanned pages with less than this share of ink "
+                             "pixels and no ink at the OCR resolution (try "
+                             f"{preprocessing.BLANK_PAGE_INK}; default: off)")
+    parser.add_argument("--duplicate-page-change", type=float, default=0.0, metavar="FRACTION",
+                        help="reuse the OCR text of the previous page when less than this "
+                             "share of pixels changed and the page renders identically (try "
+                             f"{preprocessing.DUPLICATE_PAGE_CHANGE}; default: off)")
+    parser.add_argument("--memory-limit-mb", type=int,
+                        help="fail a conversion whose process memory (RSS) stays above this "
+                             "many MB between pages (default: no limit)")
+    parser.add_argument("--cache-dir",
+                        help="reuse results for PDFs converted before with the same settings")
+    parser.add_argument("--cache-max-mb", type=int,
+                        default=cache_store.DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="size limit for --cache-dir, least recently used entries "
+                             "are evicted first (default: %(default)s)")
+    parser.add_argument("--page-cache-dir",
+                        help="reuse OCR text for pages that render identically to ones seen before")
+    parser.add_argument("--page-cache-max-mb", type=int,
+                        default=cache_store.DEFAULT_PAGE_MAX_BYTES // (1024 * 1024),
+                        help="size limit for --page-cache-dir (default: %(default)s)")
+    parser.add_argument("--journal-dir",
+                        help="record finished pages here so an interrupted OCR conversion "
+                             "resumes where it stopped (deleted once the file is done)")
+    parser.add_argument("--incremental-dir",
+                        help="keep every converted page here, so a revised PDF only re-converts "
+                             "the pages that changed")
+    parser.add_argument("--log-json",
+                        help="append JSON lines with per-job and per-page timings to this file")
+    parser.add_argument("--metrics-file",
+                        help="keep Prometheus text-format metrics in this file (updated per job)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics at http://127.0.0.1:PORT/metrics during the run")
+
+
+def check_conversion_arguments(args):
+    """Return an error message for unusable conversion options, or None"""
+    if min(args.workers, args.ocr_workers, args.layout_workers, args.chunk_size) < 1:
+        return "--workers, --ocr-workers, --layout-workers and --chunk-size must be at least 1"
+    if not (0 <= args.blank_page_ink < 1 and 0 <= args.duplicate_page_change < 1):
+        return "--blank-page-ink and --duplicate-page-change must be at least 0 and below 1"
+    if args.memory_limit_mb is not None and args.memory_limit_mb < 1:
+        return "--memory-limit-mb must be at least 1"
+    if args.ocr_backend == "tesserocr" and importlib.util.find_spec("tesserocr") is None:
+        return "--ocr-backend tesserocr needs the tesserocr package (pip install tesserocr)"
+    return None
+
+
+def conversion_options(args):
+    """engine.ConversionOptions for the parsed conversion arguments"""
+    return engine.ConversionOptions(
+        ocr_workers=args.ocr_workers,
+        raster_mode="spill" if args.spill_rasters else "memory",
+        layout_workers=args.layout_workers,
+        layout_chunk_size=args.chunk_size,
+        memory_limit_mb=args.memory_limit_mb,
+        text_backend=args.text_backend,
+        blank_page_ink=args.blank_page_ink,
+        duplicate_page_change=args.duplicate_page_change,
+        ocr_images=args.ocr_images,
+        journal_dir=args.journal_dir,
+        incremental_dir=args.incremental_dir,
+        ocr_settings=ocr.OCRSettings(
+            resolution=args.ocr_dpi,
+            lang=args.ocr_lang,
+            backend=args.ocr_backend,
+            adaptive_resolution=args.adaptive_dpi,
+            preprocess=args.preprocess,
+            deskew=args.deskew))
+
+
+def cache_arguments(args):
+    """init_worker() arguments for the parsed cache options"""
+    return (args.cache_dir, args.cache_max_mb * 1024 * 1024,
+            args.page_cache_dir, args.page_cache_max_mb * 1024 * 1024)
+
+
+def start_telemetry(args):
+    """Metrics registry and JSON log for the parsed options; starts the metrics server"""
+    registry = telemetry.MetricsRegistry()
+    json_log = telemetry.JsonLogWriter(args.log_json) if args.log_json else None
+    if args.metrics_port:
+        telemetry.serve_metrics(registry, args.metrics_port)
+        print(f"📈 Metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+    return registry, json_log
+
+
+def record_result(args, registry, json_log, result):
+    """Add a convert_job() result to the metrics, JSON log and metrics file"""
+    registry.record(result["metrics"])
+    if json_log:
+        json_log.write_job(result["metrics"])
+    if args.metrics_file:
+        registry.write_textfile(args.metrics_file)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Convert PDF files to Word documents (DOCX) in parallel.")
+    parser.add_argument("inputs", nargs="+",
+                        help="PDF files, glob patterns or directories to convert")
+    parser.add_argument("-o", "--output-dir",
+                        help="write DOCX files here instead of next to each PDF")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="search directories and ** patterns recursively")
+    parser.add_argument("--triage", action="store_true",
+                        help="only print how auto mode would route each page")
+    add_conversion_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    error = check_conversion_arguments(args)
+    if error:
+        print(f"❌ {error}")
+        return 2
+    options = conversion_options(args)
+
+    pdf_files = collect_inputs(args.inputs, args.recursive)
+    if not pdf_files:
+        print("❌ No PDF files found")
+        return 2
+
+    if args.triage:
+        print_triage(pdf_files)
+        return 0
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # Hand out output names up front so parallel jobs never pick the same file
+    reserved = set()
+    jobs = []
+    for pdf_path in pdf_files:
+        docx_path = engine.get_output_path(pdf_path, args.output_dir, reserved)
+        reserved.add(docx_path)
+        jobs.append((pdf_path, docx_path))
+
+    workers = min(args.workers, len(jobs))
+    print(f"🚀 Converting {len(jobs)} file(s) with {workers} worker(s), mode: {args.mode}")
+
+    registry, json_log = start_telemetry(args)
+
+    results = []
+    started = time.perf_counter()
+    cache_args = cache_arguments(args)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=cache_args) as pool:
+        futures = [pool.submit(convert_job, pdf_path, docx_path, args.mode, options)
+                   for pdf_path, docx_path in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            record_result(args, registry, json_log, result)
+            mark = "✅" if result["success"] else "❌"
+            cached = ", cached" if result["cache"] == "hit" else ""
+            print(f"{mark} [{len(results)}/{len(jobs)}] {result['input']} "
+                  f"({result['pages']} pages, {result['seconds']:.2f} s{cached})")
+    wall_time = time.perf_counter() - started
+
+    print_summary(results, wall_time, workers)
+    return 0 if all(r["success"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Streaming DOCX writer for PDF to Word Converter
+Writes paragraphs straight into the output package instead of building a Document in memory
+"""
+
+import io
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.shared import Pt
+
+DOCUMENT_PART = "word/document.xml"
+
+# The package is written to docx_path + TEMP_SUFFIX and renamed when complete
+TEMP_SUFFIX = ".part"
+
+# Characters XML 1.0 can't carry; python-docx refuses them, here they are dropped
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _text_element(text):
+    """A <w:t> element, preserving surrounding whitespace the way python-docx does"""
+    space = ' xml:space="preserve"' if len(text.strip()) < len(text) else ""
+    return f"<w:t{space}>{escape(text)}</w:t>"
+
+
+def paragraph_xml(text):
+    """Body XML for doc.add_paragraph(text): one run, tabs and line breaks as elements"""
+    text = _INVALID_XML_CHARS.sub("", text)
+    parts = []
+    for piece in re.split(r"([\t\r\n])", text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            parts.append(_text_element(piece))
+    return f"<w:p><w:r>{''.join(parts)}</w:r></w:p>"
+
+
+class StreamingDocxWriter:
+    """Write a plain-paragraph DOCX page by page with flat memory use
+
+    The package is copied from python-docx's default template (with the Normal
+    style's font size set once), and word/document.xml is streamed into the
+    zip as paragraphs arrive. The file is written as docx_path + TEMP_SUFFIX and
+    only renamed into place by close(), so a crash never leaves a truncated
+    DOCX behind. docx_path may also be a writable binary stream, which the
+    package is then written to directly.
+    """
+
+    def __init__(self, docx_path, font_size=12):
+        self.docx_path = docx_path
+        self._part_path = None if hasattr(docx_path, "write") else docx_path + TEMP_SUFFIX
+
+        template = Document()
+        template.styles["Normal"].font.size = Pt(font_size)
+        buffer = io.BytesIO()
+        template.save(buffer)
+
+        self._zip = zipfile.ZipFile(self._part_path or docx_path, "w", zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(buffer) as src:
+            for info in src.infolist():
+                if info.filename == DOCUMENT_PART:
+                    document_xml = src.read(info).decode("utf-8")
+                else:
+                    self._zip.writestr(info, src.read(info))
+
+        # Split the empty template body around where paragraphs go
+        body_start = document_xml.index("<w:body>") + len("<w:body>")
+        self._tail = document_xml[body_start:].encode("utf-8")
+        self._body = self._zip.open(DOCUMENT_PART, "w")
+        self._body.write(document_xml[:body_start].encode("utf-8"))
+
+    def add_paragraph(self, text):
+        """Append one paragraph to the document body"""
+        self._body.write(paragraph_xml(text).encode("utf-8"))
+
+    def close(self):
+        """Finish the package and move it to docx_path"""
+        self._body.write(self._tail)
+        self._body.close()
+        self._zip.close()
+        if self._part_path is not None:
+            os.replace(self._part_path, self.docx_path)
+
+    def abort(self):
+        """Discard a partly written document"""
+        try:
+            self._body.close()
+            self._zip.close()
+        finally:
+            if self._part_path is not None and os.path.exists(self._part_path):
+                os.remove(self._part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,762 @@
+"""
+Conversion engine for PDF to Word Converter
+GUI-free, so it can be driven from the Tk app, the batch CLI or worker processes
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import dataclasses
+from dataclasses import dataclass, field
+from importlib import metadata
+import pytesseract
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.shared import Pt
+import pdf_to_word_cache as cache_store
+import pdf_to_word_docx as docx_writer
+import pdf_to_word_incremental as incremental
+import pdf_to_word_journal as journal_store
+import pdf_to_word_layout as layout
+import pdf_to_word_metrics as telemetry
+import pdf_to_word_ocr as ocr
+import pdf_to_word_progress as progress
+import pdf_to_word_source as pdf_source
+import pdf_to_word_tesseract as tesseract
+import pdf_to_word_triage as triage
+
+# Modes understood by pdf_to_word_best
+CONVERSION_MODES = ("auto", "text", "ocr")
+
+# Places to look for the Tesseract executable, in order
+TESSERACT_PATHS = tesseract.TESSERACT_PATHS
+
+
+@dataclass
+class ConversionOptions:
+    """Tuning knobs for a conversion; the defaults match the GUI's behaviour"""
+    # Worker processes for OCR of scanned pages (1 = OCR in this process)
+    ocr_workers: int = 1
+    # "memory" pipes page rasters straight to Tesseract, "spill" writes them
+    # to a private temp directory first (for low-memory hosts)
+    raster_mode: str = "memory"
+    # Rendering, preprocessing and Tesseract language for scanned pages
+    ocr_settings: ocr.OCRSettings = field(default_factory=ocr.OCRSettings)
+    # Stream plain-text output into the DOCX package instead of building a
+    # python-docx Document in memory (same document, flat memory)
+    stream_docx: bool = True
+    # Worker processes for pdf2docx page parsing (1 = single process, as before)
+    layout_workers: int = 1
+    # Pages per pdf2docx worker task when layout_workers > 1
+    layout_chunk_size: int = layout.DEFAULT_CHUNK_SIZE
+    # Stop with an error if this process's RSS stays above this many MB at a
+    # page boundary, even after page caches are released (None = no limit)
+    memory_limit_mb: int = None
+    # Where page text comes from in OCR mode and the auto-mode fallback:
+    # "pdfplumber" for fidelity, "pdfium" for throughput (see pdf_to_word_source)
+    text_backend: str = "pdfplumber"
+    # Scanned pages whose low-resolution preview has less than this share of
+    # ink pixels, and no ink at all at the OCR resolution, are blank and skip
+    # OCR (0 = OCR every page; pdf_to_word_preprocess.BLANK_PAGE_INK is a
+    # good start)
+    blank_page_ink: float = 0.0
+    # A scanned page whose preview differs from the page before it in less
+    # than this share of pixels, and that renders pixel-identical to it at
+    # the OCR resolution, reuses that page's OCR text (0 = off;
+    # pdf_to_word_preprocess.DUPLICATE_PAGE_CHANGE is a good start)
+    duplicate_page_change: float = 0.0
+    # Also OCR the images on pages that have a text layer (figures, stamps,
+    # signatures) and merge their text in reading order; OCR mode only
+    ocr_images: bool = False
+    # Record every finished page in a journal under this directory, so an
+    # interrupted conversion of the same file and settings resumes where it
+    # stopped; the journal is deleted once the DOCX is written (None = off)
+    journal_dir: str = None
+    # Keep every converted page's output under this directory, keyed by the
+    # page's content, so converting a revised PDF only redoes the pages that
+    # changed (None = off)
+    incremental_dir: str = None
+
+
+def find_tesseract():
+    """Locate a working Tesseract executable and point pytesseract at it
+
+    Returns the path that worked, or None if Tesseract is not available.
+    The search is remembered across runs (see pdf_to_word_tesseract), so
+    worker processes don't each start Tesseract just to find it.
+    """
+    path, _ = tesseract.discover()
+    if path is None:
+        return None
+    pytesseract.pytesseract.tesseract_cmd = path
+    print(f"✅ Tesseract found at: {path}")
+    return path
+
+
+def get_output_path(input_path, output_dir=None, reserved=None):
+    """Generate output path that doesn't overwrite existing files
+
+    If output_dir is given the DOCX goes there instead of next to the PDF.
+    Paths in the optional reserved set are treated as taken, so a batch can
+    hand out names before any of the files exist.
+    """
+    base, ext = os.path.splitext(input_path)
+    if output_dir:
+        base = os.path.join(output_dir, os.path.basename(base))
+    reserved = reserved if reserved is not None else set()
+
+    output_path = f"{base}.docx"
+    counter = 1
+
+    while os.path.exists(output_path) or output_path in reserved:
+        output_path = f"{base}_{counter}.docx"
+        counter += 1
+
+    return output_path
+
+
+def ocr_scanned_pages(source, scanned, options, page_cache=None, metrics=None, tracker=None,
+                      journal=None):
+    """OCR the given page indexes of an open PDFSource
+
+    Returns a dict mapping page index to text; uses a process pool when
+    options.ocr_workers allows it, and skips Tesseract for pages found in
+    page_cache. Blank and near-duplicate pages (see ocr.screen_pages) skip
+    Tesseract altogether. Page timings are recorded in metrics (a
+    JobMetrics), and finished pages counted on tracker (a ProgressTracker),
+    if given. With a journal (a PageJournal), pages it already holds are
+    taken from it and every page read successfully is added to it.
+    """
+    return dict(iter_scanned_pages(source, scanned, options, page_cache, metrics, tracker,
+                                   journal))
+
+
+def iter_scanned_pages(source, scanned, options, page_cache=None, metrics=None, tracker=None,
+                       journal=None):
+    """ocr_scanned_pages as a generator of (page index, text)
+
+    Each page is yielded as soon as its text is final: pages from the
+    journal and blank pages first, then OCR'd pages in page order, each
+    followed by the duplicates that reuse its text.
+    """
+    metrics = metrics if metrics is not None else telemetry.JobMetrics()
+    tracker = tracker if tracker is not None else progress.ProgressTracker()
+
+    if journal is not None:
+        resumed = [i for i in scanned if i in journal]
+        if resumed:
+            tracker.advance(len(resumed))
+            scanned = [i for i in scanned if i not in journal]
+        for i in resumed:
+            metrics.page(i, "ocr", None, False, resumed=True)
+            yield i, journal.text(i)
+
+    skipped = {}
+    if scanned and (options.blank_page_ink > 0 or options.duplicate_page_change > 0):
+        started = time.perf_counter()
+        skipped = ocr.screen_pages(source, scanned, options.blank_page_ink,
+                                   options.duplicate_page_change,
+                                   options.ocr_settings.resolution)
+        metrics.add_time("screen", time.perf_counter() - started)
+        if skipped:
+            blank = sum(1 for reason, _ in skipped.values() if reason == "blank")
+            print(f"🔹 Skipping OCR for {blank} blank and {len(skipped) - blank} "
+                  f"duplicate page(s)")
+            tracker.advance(len(skipped))
+            scanned = [i for i in scanned if i not in skipped]
+
+    # Duplicates wait for the page whose text they reuse
+    duplicates = {}
+    for i, (reason, original) in sorted(skipped.items()):
+        if reason == "duplicate":
+            duplicates.setdefault(original, []).append(i)
+
+    def finished(i, text, skipped_as=None):
+        """Yield a page whose text is final, then the duplicates of it"""
+        if skipped_as is not None:
+            metrics.page(i, "ocr", 0.0, False, cache_hit=False, skipped=skipped_as)
+            if journal is not None:
+                journal.record(i, "ocr", text, skipped=skipped_as)
+        yield i, text
+        for duplicate in duplicates.pop(i, []):
+            yield from finished(duplicate, text, "duplicate")
+
+    for i, (reason, _) in sorted(skipped.items()):
+        if reason == "blank":
+            yield from finished(i, "", "blank")
+
+    def ocr_finished(i, text, timings):
+        seconds = 0.0
+        for stage in ("render", "preprocess", "ocr"):
+            if stage in timings:
+                metrics.add_time(stage, timings[stage])
+                seconds += timings[stage]
+        metrics.page(i, "ocr", seconds, timings["failed"], cache_hit=timings["cache_hit"],
+                     skipped=None)
+        if journal is not None and not timings["failed"]:
+            journal.record(i, "ocr", text)
+        tracker.advance()
+        source.page_done()
+        return finished(i, text)
+
+    spill = (tempfile.TemporaryDirectory(prefix="pdf_to_word_")
+             if options.raster_mode == "spill" else contextlib.nullcontext())
+    with spill as spill_dir:
+        if options.ocr_workers > 1 and len(scanned) > 1:
+            print(f"🔹 OCR of {len(scanned)} page(s) on {options.ocr_workers} worker(s)...")
+            for i, text, timings in ocr.iter_ocr_pages(source.path, scanned, options.ocr_workers,
+                                                       options.ocr_settings, spill_dir,
+                                                       page_cache):
+                yield from ocr_finished(i, text, timings)
+        else:
+            for i in scanned:
+                print(f"🔹 Page {i+1}: No text found, using OCR...")
+                timings = {}
+                text = ocr.ocr_page(source.page(i), i + 1, options.ocr_settings, spill_dir,
+                                    page_cache, timings)
+                yield from ocr_finished(i, text, timings)
+
+
+def page_text_with_images(source, index, options, page_cache=None, metrics=None):
+    """Text of a text page with its embedded images OCR'd in place
+
+    Only the image regions are rendered and read (see
+    PDFSource.page_blocks), not the whole page. Returns (text, number of
+    regions OCR'd, seconds spent on them).
+    """
+    parts = []
+    regions = 0
+    seconds = 0.0
+    for kind, value in source.page_blocks(index):
+        if kind == "text":
+            parts.append(value)
+            continue
+        timings = {}
+        text = ocr.ocr_page(source.page(index).region(value), index + 1, options.ocr_settings,
+                            page_cache=page_cache, timings=timings)
+        regions += 1
+        for stage in ("render", "preprocess", "ocr"):
+            if stage in timings:
+                seconds += timings[stage]
+                if metrics is not None:
+                    metrics.add_time(stage, timings[stage])
+        if not timings["failed"] and text.strip():
+            parts.append(text.strip())
+    return "\n".join(parts), regions, seconds
+
+
+def convert_mixed(cv, source, docx_path, pages, options, page_cache=None, metrics=None,
+                  tracker=None, journal=None):
+    """Build one DOCX from a triaged document
+
+    Layout pages are parsed by pdf2docx and OCR pages by Tesseract; both are
+    written into the same Document in page order, one section per page the
+    way pdf2docx lays out its own output. cv must be source's converter().
+    Only the OCR pages go through journal, unless it is a PageHistory, which
+    also keeps the layout pages.
+    """
+    metrics = metrics if metrics is not None else telemetry.JobMetrics()
+    tracker = tracker if tracker is not None else progress.ProgressTracker()
+    layout_pages = [p.index for p in pages if p.route == "layout"]
+    scanned = [p.index for p in pages if p.route == "ocr"]
+
+    tracker.stage("ocr")
+    ocr_texts = ocr_scanned_pages(source, scanned, options, page_cache, metrics, tracker, journal)
+
+    print(f"🔹 pdf2docx for {len(layout_pages)} text page(s)...")
+    tracker.stage("layout")
+    with metrics.stage("layout"):
+        _parse_layout(cv, source, layout_pages, options, tracker, journal)
+    for i in layout_pages:
+        metrics.page(i, "layout")
+
+    tracker.stage("save")
+    save_started = time.perf_counter()
+    doc = Document()
+    for p in pages:
+        if p.route == "layout":
+            cv.pages[p.index].make_docx(doc)
+        else:
+            section = doc.add_section(WD_SECTION.NEW_PAGE) if doc.paragraphs else doc.sections[0]
+            rect = cv.fitz_doc[p.index].rect
+            section.page_width = Pt(rect.width)
+            section.page_height = Pt(rect.height)
+            text = ocr_texts[p.index]
+            if text.strip():
+                paragraph = doc.add_paragraph(text.strip())
+                paragraph.style.font.size = Pt(12)
+        # Both kinds of page only start a new section once the document has a
+        # paragraph, so a page that wrote nothing (blank scan, empty OCR) must
+        # leave one behind or the next page would share its section
+        if not doc.paragraphs:
+            doc.add_paragraph()
+
+    doc.save(docx_path)
+    metrics.add_time("save", time.perf_counter() - save_started)
+
+
+def package_version(name):
+    """Installed version of a distribution, or None if it can't be determined"""
+    try:
+        return metadata.version(name)
+    except Exception:
+        return None
+
+
+def cache_settings(conversion_mode, options):
+    """Everything besides the PDF bytes that changes the DOCX a conversion produces"""
+    settings = {
+        "mode": conversion_mode,
+        "pdf2docx": package_version("pdf2docx"),
+        # Parallel layout is merged page by page and should match, but a result
+        # from one worker/chunk setup is never handed out for another
+        "layout_workers": options.layout_workers,
+        "layout_chunk_size": options.layout_chunk_size,
+    }
+    if conversion_mode != "text":
+        backend = ocr.get_backend(options.ocr_settings.backend, options.ocr_settings.lang)
+        settings.update({
+            "text_backend": options.text_backend,
+            "blank_page_ink": options.blank_page_ink,
+            "duplicate_page_change": options.duplicate_page_change,
+            "ocr_images": options.ocr_images,
+            "ocr": dataclasses.asdict(options.ocr_settings),
+            "engine": backend.name,
+            "tesseract": backend.version,
+        })
+    return settings
+
+
+def pdf_to_word_best(pdf_path, docx_path, conversion_mode="auto", options=None, cache=None,
+                     page_cache=None, metrics=None, on_progress=None, cancel=None):
+    """Convert PDF to DOCX with specified mode
+
+    If a ConversionCache is given, a previous result for the same PDF bytes
+    and settings is copied to docx_path instead of converting again.
+    page_cache (a ConversionCache with suffix ".txt") does the same for the
+    OCR text of individual pages, keyed by the rendered pixels. A JobMetrics
+    passed as metrics is filled with stage and per-page timings.
+
+    on_progress is called with a ProgressEvent (pages done, stage, ETA) as
+    the conversion advances. Cancelling the CancelToken passed as cancel
+    stops the conversion at the next page boundary: the partial output is
+    removed and ConversionCancelled is raised.
+    """
+    options = options or ConversionOptions()
+    metrics = metrics if metrics is not None else telemetry.JobMetrics()
+    metrics.input, metrics.mode = pdf_path, conversion_mode
+    if not os.path.exists(pdf_path):
+        print(f"❌ Error: PDF file not found: {pdf_path}")
+        metrics.error = "PDF file not found"
+        metrics.finish(False)
+        return False
+
+    # Remove existing output file
+    if os.path.exists(docx_path):
+        try:
+            os.remove(docx_path)
+        except Exception as e:
+            print(f"⚠️ Warning: Could not remove existing file: {e}")
+
+    tracker = progress.ProgressTracker(on_progress, cancel)
+    try:
+        tracker.check()
+        if cache is None:
+            success = _convert(pdf_path, docx_path, conversion_mode, options, page_cache,
+                               metrics, tracker)
+            metrics.finish(success)
+            return success
+
+        key = cache_store.make_key(cache_store.hash_file(pdf_path),
+                                   cache_settings(conversion_mode, options))
+        if cache.fetch(key, docx_path):
+            print(f"✅ Cache hit: {docx_path}")
+            metrics.cache = "hit"
+            metrics.finish(True)
+            return True
+
+        metrics.cache = "miss"
+        success = _convert(pdf_path, docx_path, conversion_mode, options, page_cache,
+                           metrics, tracker)
+    except progress.ConversionCancelled:
+        print("⏹️ Conversion cancelled")
+        metrics.error = "cancelled"
+        metrics.finish(False)
+        if os.path.exists(docx_path):
+            try:
+                os.remove(docx_path)
+            except Exception as e:
+                print(f"⚠️ Warning: Could not remove partial output: {e}")
+        raise
+
+    if success:
+        try:
+            cache.store(key, docx_path)
+        except Exception as e:
+            print(f"⚠️ Warning: Could not store result in cache: {e}")
+    metrics.finish(success)
+    return success
+
+
+def pdf_to_word_bytes(pdf, conversion_mode="auto", options=None, output=None, cache=None,
+                      page_cache=None, metrics=None, on_progress=None, cancel=None):
+    """Convert a PDF held in memory: pdf is bytes or a readable binary stream
+
+    Returns the DOCX as bytes, or None if the conversion failed (metrics.error
+    says why). With output, a writable binary stream, the DOCX is written
+    there instead and True or False is returned; nothing is written to it
+    unless the conversion succeeds. The PDF is read from memory by every
+    stage. It only goes to disk, in a private temporary directory removed
+    afterwards, if OCR or pdf2docx worker processes (ocr_workers or
+    layout_workers above 1) have to open it themselves. cache, page_cache,
+    metrics, on_progress and cancel work as in pdf_to_word_best.
+    """
+    options = options or ConversionOptions()
+    metrics = metrics if metrics is not None else telemetry.JobMetrics()
+    metrics.mode = conversion_mode
+    data = bytes(pdf.read() if hasattr(pdf, "read") else pdf)
+    buffer = io.BytesIO()
+
+    tracker = progress.ProgressTracker(on_progress, cancel)
+    try:
+        tracker.check()
+        key = cached = None
+        if cache is not None:
+            key = cache_store.make_key(cache_store.hash_bytes(data),
+                                       cache_settings(conversion_mode, options))
+            cached = cache.read(key)
+            metrics.cache = "miss" if cached is None else "hit"
+        if cached is not None:
+            print("✅ Cache hit")
+            buffer.write(cached)
+            success = True
+        else:
+            success = _convert(data, buffer, conversion_mode, options, page_cache, metrics,
+                               tracker)
+            if success and key is not None:
+                try:
+                    cache.write(key, buffer.getvalue())
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not store result in cache: {e}")
+    except progress.ConversionCancelled:
+        print("⏹️ Conversion cancelled")
+        metrics.error = "cancelled"
+        metrics.finish(False)
+        raise
+    metrics.finish(success)
+
+    if output is not None:
+        if success:
+            output.write(buffer.getbuffer())
+        return success
+    return buffer.getvalue() if success else None
+
+
+def save_text_docx(texts, docx_path, options, metrics=None):
+    """Write one 12 pt paragraph per non-empty page text, in order
+
+    texts may be any iterable. With options.stream_docx the writer is open
+    before the first text is asked for and each paragraph goes straight
+    into the DOCX package, so a generator that yields pages as they are
+    converted keeps memory flat. docx_path may also be a writable binary
+    stream. Time spent writing, but not producing texts, goes to metrics'
+    "save" stage.
+    """
+    metrics = metrics if metrics is not None else telemetry.JobMetrics()
+    if options.stream_docx:
+        with metrics.stage("save"):
+            writer = docx_writer.StreamingDocxWriter(docx_path, font_size=12)
+        try:
+            for text in texts:
+                if text.strip():  # Only add non-empty paragraphs
+                    with metrics.stage("save"):
+                        writer.add_paragraph(text.strip())
+        except BaseException:
+            writer.abort()
+            raise
+        with metrics.stage("save"):
+            writer.close()
+        return
+
+    doc = Document()
+    doc.styles["Normal"].font.size = Pt(12)
+    for text in texts:
+        if text.strip():  # Only add non-empty paragraphs
+            doc.add_paragraph(text.strip())
+    with metrics.stage("save"):
+        doc.save(docx_path)
+
+
+def _ocr_path_texts(source, page_count, all_scanned, options, page_cache, metrics, tracker,
+                    journal=None):
+    """Page texts for the OCR path, in page order, each as soon as it is final
+
+    Text pages are extracted first, then the pages without text are OCR'd
+    (see iter_scanned_pages). A page is yielded once it and every page
+    before it are done; only text pages waiting for an earlier OCR page are
+    held in memory meanwhile.
+    """
+    done = {}
+    next_page = 0
+
+    def ready():
+        nonlocal next_page
+        while next_page in done:
+            yield done.pop(next_page)
+            next_page += 1
+
+    if all_scanned:
+        # Triage already found no text on any page; extraction wouldn't either
+        scanned = list(range(page_count))
+    else:
+        tracker.stage("extract_text")
+        scanned = []
+        for i in range(page_count):
+            if journal is not None and i in journal:
+                # OCR pages are taken from the journal by iter_scanned_pages
+                text = journal.text(i) if journal.route(i) == "text" else ""
+                if text:
+                    metrics.page(i, "text", None, resumed=True)
+                    tracker.advance()
+                    done[i] = text
+                    yield from ready()
+                else:
+                    scanned.append(i)
+                continue
+            started = time.perf_counter()
+            regions = 0
+            if options.ocr_images:
+                text, regions, ocr_seconds = page_text_with_images(
+                    source, i, options, page_cache, metrics)
+            else:
+                text, ocr_seconds = source.extract_text(i), 0.0
+            seconds = time.perf_counter() - started
+            metrics.add_time("extract_text", seconds - ocr_seconds)
+            source.page_done()
+            if text:
+                if regions:
+                    metrics.page(i, "text", seconds, image_regions=regions)
+                else:
+                    metrics.page(i, "text", seconds)
+                if journal is not None:
+                    journal.record(i, "text", text)
+                tracker.advance()
+                done[i] = text
+                yield from ready()
+            else:
+                # If no text found, use OCR
+                tracker.check()
+                scanned.append(i)
+
+    if scanned:
+        tracker.stage("ocr")
+    for i, text in iter_scanned_pages(source, scanned, options, page_cache, metrics, tracker,
+                                      journal):
+        done[i] = text
+        yield from ready()
+    tracker.stage("save")
+
+
+def _layout_path(source, options):
+    """The PDF's path for layout.parse_into, asked for only when worker processes need a file"""
+    return source.path if options.layout_workers > 1 else None
+
+
+def _parse_layout(cv, source, pages, options, tracker, history=None):
+    """layout.parse_into for the given pages, taking those history holds from it
+
+    With a PageHistory, only the pages it doesn't have are parsed; the rest
+    are restored into cv from their stored layouts, and the newly parsed
+    ones are added to it.
+    """
+    stored = {}
+    if isinstance(history, incremental.PageHistory):
+        for i in pages:
+            page_layout = history.layout(i)
+            if page_layout is not None:
+                stored[i] = page_layout
+    else:
+        history = None
+    todo = [i for i in pages if i not in stored]
+    if todo:  # pdf2docx reads an empty page list as every page
+        layout.parse_into(cv, _layout_path(source, options), todo, options.layout_workers,
+                          options.layout_chunk_size, on_pages=_layout_progress(source, tracker))
+    if stored:
+        cv.restore({"page_cnt": len(cv.fitz_doc), "pages": list(stored.values())})
+        tracker.advance(len(stored))
+    if history is not None:
+        for i in todo:
+            if cv.pages[i].finalized:
+                history.record_layout(i, cv.pages[i].store())
+
+
+def _layout_progress(source, tracker):
+    """on_pages callback for layout.parse_into: count the pages, then check memory"""
+    def on_pages(pages):
+        tracker.advance(pages)
+        source.page_done()
+    return on_pages
+
+
+def open_journal(pdf, conversion_mode, options):
+    """The PageJournal for this PDF (a path or bytes) and settings, or None
+
+    Journals live under options.journal_dir; None when that isn't set.
+    """
+    if not options.journal_dir or conversion_mode == "text":
+        return None  # Text mode is pdf2docx alone, nothing to resume page by page
+    try:
+        content_hash = (cache_store.hash_bytes(pdf) if isinstance(pdf, bytes)
+                        else cache_store.hash_file(pdf))
+        key = cache_store.make_key(content_hash, cache_settings(conversion_mode, options))
+        journal = journal_store.PageJournal(options.journal_dir, key)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not open the page journal: {e}")
+        return None
+    if len(journal):
+        print(f"🔹 Resuming: {len(journal)} page(s) already done ({journal.path})")
+    return journal
+
+
+def open_history(source, conversion_mode, options, journal=None):
+    """The PageHistory for this open PDFSource and settings, or None
+
+    Page outputs live under options.incremental_dir; None when that isn't
+    set. journal, if given, keeps receiving every finished page.
+    """
+    if not options.incremental_dir:
+        return None
+    try:
+        started = time.perf_counter()
+        fingerprints = [source.page_fingerprint(i) for i in range(source.page_count)]
+        store = cache_store.ConversionCache(options.incremental_dir, suffix=".json")
+        history = incremental.PageHistory(store, fingerprints,
+                                          cache_settings(conversion_mode, options), journal)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not open the incremental page store: {e}")
+        return None
+    print(f"🔹 Fingerprinted {len(fingerprints)} page(s) in "
+          f"{time.perf_counter() - started:.2f} s for incremental conversion")
+    return history
+
+
+def _convert(pdf, docx_path, conversion_mode, options, page_cache, metrics, tracker):
+    """Run the conversion itself (pdf2docx and/or OCR) on one shared open PDF
+
+    pdf is a path or the PDF's bytes, docx_path a path or a writable stream.
+    """
+    source = pdf_source.PDFSource(pdf, options.memory_limit_mb, options.text_backend)
+    journal = open_journal(pdf, conversion_mode, options)
+    history = None
+    success = False
+    try:
+        history = open_history(source, conversion_mode, options, journal)
+        success = _convert_source(source, docx_path, conversion_mode, options, page_cache,
+                                  metrics, tracker, journal if history is None else history)
+        if success and history is not None:
+            reused = len(history.reused)
+            metrics.incremental = {"reused": reused, "recomputed": source.page_count - reused}
+            print(f"🔹 Incremental: {reused} page(s) reused, "
+                  f"{source.page_count - reused} recomputed")
+        return success
+    except pdf_source.MemoryLimitExceeded as e:
+        print(f"❌ Stopped: {e}")
+        metrics.error = str(e)
+        return False
+    finally:
+        source.close()
+        metrics.peak_rss_bytes = source.peak_rss or None
+        if journal is not None:
+            # Kept after a failure or cancellation, so the next run resumes
+            journal.close(remove=success)
+
+
+def _convert_source(source, docx_path, conversion_mode, options, page_cache, metrics, tracker,
+                    journal=None):
+    """_convert's body: every stage reads its pages through source
+
+    journal is a PageJournal or a PageHistory (see open_history).
+    """
+    # Set when triage found no text on any page
+    all_scanned = False
+
+    # Method 1: Try pdf2docx first (for auto and text-based modes)
+    if conversion_mode in ["auto", "text"]:
+        print("🔹 Trying pdf2docx...")
+        try:
+            tracker.stage("open")
+            with metrics.stage("open"):
+                cv = source.converter()
+            try:
+                tracker.start(len(cv.fitz_doc))
+                # Auto mode: classify pages first so scanned pages go to OCR
+                # and a fully scanned document skips pdf2docx altogether
+                tracker.stage("triage")
+                with metrics.stage("triage"):
+                    pages = triage.triage_pages(cv.fitz_doc) if conversion_mode == "auto" else []
+                scanned = [p for p in pages if p.route == "ocr"]
+                for p in scanned:
+                    print(f"🔹 Page {p.index+1}: {p.kind} ({p.reason})")
+
+                if not scanned:
+                    # layout.convert_layout, timed in two stages
+                    tracker.stage("layout")
+                    with metrics.stage("layout"):
+                        _parse_layout(cv, source, range(len(cv.fitz_doc)), options, tracker,
+                                      journal)
+                    tracker.stage("save")
+                    with metrics.stage("save"):
+                        cv.make_docx(docx_path, **cv.default_settings)
+                    for i in range(len(cv.fitz_doc)):
+                        metrics.page(i, "layout")
+                    print("✅ Converted using pdf2docx!")
+                    return True
+                if len(scanned) < len(pages):
+                    convert_mixed(cv, source, docx_path, pages, options, page_cache, metrics,
+                                  tracker, journal)
+                    print("✅ Converted using pdf2docx + OCR!")
+                    return True
+                print("🔹 No text layer on any page, skipping pdf2docx")
+                all_scanned = True
+            finally:
+                cv.close()
+        except pdf_source.MemoryLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"⚠️ pdf2docx failed: {e}")
+            metrics.error = f"pdf2docx: {e}"
+            metrics.pages.clear()
+            if conversion_mode == "text":
+                return False  # Text mode failed, don't try OCR
+
+    # Method 2: Use the text backend + OCR (for auto and ocr modes)
+    if conversion_mode in ["auto", "ocr"]:
+        print("🔹 Using OCR for scanned PDF...")
+        try:
+            tracker.stage("open")
+            with metrics.stage("open"):
+                page_count = source.page_count
+                if not all_scanned:
+                    source.text_extractor
+            tracker.start(page_count)
+            # Pages go into the DOCX as they are done, in page order
+            texts = _ocr_path_texts(source, page_count, all_scanned, options, page_cache,
+                                    metrics, tracker, journal)
+            save_text_docx(texts, docx_path, options, metrics)
+            if isinstance(docx_path, str):
+                print(f"✅ OCR Conversion Successful: {docx_path}")
+            else:
+                print("✅ OCR Conversion Successful (in memory)")
+            metrics.error = None
+            return True
+
+        except pdf_source.MemoryLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"❌ Error during conversion: {e}")
+            metrics.error = str(e)
+            return False
+
+    return False
@@ -1,25 +1,44 @@
+import json
+import multiprocessing
 import os
 import sys
 import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
-import pdfplumber
-import pytesseract
-from pdf2docx import Converter
-from PIL import Image
-from docx import Document
-from docx.shared import Pt
+# Only light modules here: the conversion engine (pdfplumber, pdf2docx,
+# PyMuPDF, pytesseract, python-docx) is imported on the first conversion
+import pdf_to_word_progress as progress
+import pdf_to_word_tesseract as tesseract
+
+# Job state -> text shown in the Status column
+STATE_LABELS = {
+    "pending": "⏳ Waiting",
+    "running": "🔄 Converting",
+    "done": "✅ Done",
+    "failed": "❌ Failed",
+    "cancelled": "⏹️ Cancelled",
+}
+
+# Libraries that should not be loaded before the first conversion
+HEAVY_MODULES = ("pdfplumber", "pdf2docx", "fitz", "pytesseract", "docx", "numpy")
 
 class PDFToWordConverter:
     def __init__(self, root):
         self.root = root
+        self.queue = None  # JobQueue, created by load_engine()
+        self.tesseract_result = None  # (path, version) or an exception, from the discovery thread
+        self.startup_probe = None
+        self.batch = []  # jobs started by the last click on Convert
+        self.converting = False
         self.setup_ui()
         self.validate_tesseract()  # Validate on startup
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def setup_ui(self):
         self.root.title("PDF to Word Converter")
-        self.root.geometry("700x500")
+        self.root.geometry("760x720")
         self.root.resizable(False, False)
         self.root.configure(bg="#2D2D2D")
         
@@ -32,16 +51,21 @@ class PDFToWordConverter:
             print(f"Warning: Could not set icon: {str(e)}")
             
         # Header
-        tk.Label(self.root, text="Select a PDF File:", 
+        tk.Label(self.root, text="Select PDF Files:", 
                 bg="#2D2D2D", fg="white", font=("Helvetica", 12, "bold")).pack(pady=5)
 
-        # Input field
+        # Input field (one file, or the number of files selected)
         self.input_entry = tk.Entry(self.root, bg="#F0F0F0", width=70)
         self.input_entry.pack(padx=10, pady=5)
+        self.selected_files = []
 
-        # Browse button
-        tk.Button(self.root, text="Browse", command=self.browse_file,
-                 bg="#008080", fg="white", font=("Inter", 12, "bold")).pack(pady=5)
+        # Browse buttons
+        browse_frame = tk.Frame(self.root, bg="#2D2D2D")
+        browse_frame.pack(pady=5)
+        tk.Button(browse_frame, text="Browse", command=self.browse_file,
+                 bg="#008080", fg="white", font=("Inter", 12, "bold")).pack(side="left", padx=5)
+        tk.Button(browse_frame, text="Add Folder", command=self.browse_folder,
+                 bg="#008080", fg="white", font=("Inter", 12, "bold")).pack(side="left", padx=5)
 
         # Output path display
         tk.Label(self.root, text="Output will be saved to:",
@@ -66,6 +90,21 @@ class PDFToWordConverter:
                                          state="readonly", width=40)
         conversion_dropdown.pack(pady=5)
 
+        # Concurrency limits: OCR jobs are heavy, text-only jobs are quick
+        limits_frame = tk.Frame(self.root, bg="#2D2D2D")
+        limits_frame.pack(pady=5)
+        cpus = os.cpu_count() or 1
+        self.ocr_slots_var = tk.IntVar(value=1)
+        self.text_slots_var = tk.IntVar(value=min(2, cpus))
+        tk.Label(limits_frame, text="OCR jobs at once:", bg="#2D2D2D", fg="white",
+                 font=("Helvetica", 10)).pack(side="left")
+        tk.Spinbox(limits_frame, from_=1, to=cpus, width=3, textvariable=self.ocr_slots_var,
+                   command=self.update_limits).pack(side="left", padx=(5, 20))
+        tk.Label(limits_frame, text="Text jobs at once:", bg="#2D2D2D", fg="white",
+                 font=("Helvetica", 10)).pack(side="left")
+        tk.Spinbox(limits_frame, from_=1, to=cpus, width=3, textvariable=self.text_slots_var,
+                   command=self.update_limits).pack(side="left", padx=5)
+
         # Info label
         tk.Label(self.root, 
                  text="ℹ️ Auto mode tries text extraction first, then OCR if needed.\nText-based mode is faster for documents with selectable text.\nOCR mode is for scanned documents and images.",
@@ -76,10 +115,35 @@ class PDFToWordConverter:
                                    command=self.start_conversion, bg="#2c3e50", 
                                    fg="white", font=("inter", 12, "bold"), 
                                    padx=20, pady=5, state=tk.NORMAL)
-        self.convert_btn.pack(pady=15)
-
-        # Progress bar (hidden initially)
-        self.progress = ttk.Progressbar(self.root, mode='indeterminate', length=400)
+        self.convert_btn.pack(pady=10)
+
+        # Job list
+        list_frame = tk.Frame(self.root, bg="#2D2D2D")
+        list_frame.pack(padx=10, pady=5, fill="x")
+        self.job_list = ttk.Treeview(list_frame, columns=("file", "kind", "status", "progress"),
+                                     show="headings", height=6)
+        for column, heading, width in (("file", "File", 330), ("kind", "Type", 60),
+                                       ("status", "Status", 120), ("progress", "Progress", 200)):
+            self.job_list.heading(column, text=heading)
+            self.job_list.column(column, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.job_list.yview)
+        self.job_list.configure(yscrollcommand=scrollbar.set)
+        self.job_list.pack(side="left", fill="x", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Job list buttons
+        jobs_frame = tk.Frame(self.root, bg="#2D2D2D")
+        jobs_frame.pack(pady=5)
+        tk.Button(jobs_frame, text="Cancel Selected", command=self.cancel_selected,
+                  bg="#8B0000", fg="white", font=("inter", 10, "bold"), padx=10).pack(side="left", padx=5)
+        self.cancel_btn = tk.Button(jobs_frame, text="Cancel All", command=self.cancel_conversion,
+                                    bg="#8B0000", fg="white", font=("inter", 10, "bold"), padx=10)
+        self.cancel_btn.pack(side="left", padx=5)
+        tk.Button(jobs_frame, text="Clear Finished", command=self.clear_finished,
+                  bg="#555555", fg="white", font=("inter", 10, "bold"), padx=10).pack(side="left", padx=5)
+
+        # Overall progress bar (hidden initially)
+        self.progress = ttk.Progressbar(self.root, mode='determinate', length=400, maximum=100)
         
         # Status label
         self.status_label = tk.Label(self.root, text="", bg="#2D2D2D", fg="white")
@@ -104,166 +168,221 @@ class PDFToWordConverter:
             return None
 
     def browse_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
-        if file_path:
-            self.input_entry.delete(0, tk.END)
-            self.input_entry.insert(0, file_path)
-            self.update_output_path(file_path)
+        file_paths = filedialog.askopenfilenames(filetypes=[("PDF Files", "*.pdf")])
+        if file_paths:
+            self.set_selection(list(file_paths))
+
+    def browse_folder(self):
+        """Select every PDF in a folder"""
+        folder = filedialog.askdirectory()
+        if folder:
+            pdfs = sorted(str(p) for p in Path(folder).iterdir()
+                          if p.is_file() and p.suffix.lower() == ".pdf")
+            if not pdfs:
+                messagebox.showwarning("Warning", "No PDF files found in that folder.")
+                return
+            self.set_selection(pdfs)
+
+    def set_selection(self, file_paths):
+        """Remember the selected PDFs and show them in the input field"""
+        self.selected_files = file_paths
+        self.input_entry.delete(0, tk.END)
+        if len(file_paths) == 1:
+            self.input_entry.insert(0, file_paths[0])
+        else:
+            self.input_entry.insert(0, f"{len(file_paths)} PDF files selected")
+        self.update_output_path(file_paths[0])
 
     def update_output_path(self, input_path):
         """Update the output path display"""
         if input_path and os.path.exists(input_path):
             pdf_file = Path(input_path)
-            output_file = pdf_file.with_suffix('.docx')
-            self.output_label.config(text=str(output_file))
+            if len(self.selected_files) > 1:
+                self.output_label.config(text=f"{pdf_file.parent} (next to each PDF)")
+            else:
+                self.output_label.config(text=str(pdf_file.with_suffix('.docx')))
         else:
             self.output_label.config(text="")
 
     def validate_tesseract(self):
-        """Check if Tesseract OCR is available"""
+        """Check if Tesseract OCR is available, without holding up the window
+
+        The lookup may start Tesseract (several times, on a first launch), so
+        it runs on a background thread and poll_tesseract reports the outcome.
+        """
+        threading.Thread(target=self.discover_tesseract, daemon=True).start()
+        self.root.after(100, self.poll_tesseract)
+
+    def discover_tesseract(self):
+        """Runs on the discovery thread"""
         try:
-            possible_paths = [
-                r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-                r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-                "tesseract"
-            ]
-            
-            for path in possible_paths:
-                try:
-                    pytesseract.pytesseract.tesseract_cmd = path
-                    pytesseract.get_tesseract_version()
-                    print(f"✅ Tesseract found at: {path}")
-                    return True
-                except Exception:
-                    continue
-            
-            messagebox.showwarning("Warning", 
-                                 "Tesseract OCR not found. OCR functionality will not be available.\n\n"
-                                 "Please install Tesseract for scanned PDF support:\n"
-                                 "Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki\n"
-                                 "macOS: brew install tesseract\n"
-                                 "Linux: sudo apt-get install tesseract-ocr")
-            return False
+            self.tesseract_result = tesseract.discover()
         except Exception as e:
-            messagebox.showerror("Error", f"Tesseract validation failed: {str(e)}")
-            return False
+            self.tesseract_result = e
 
-    def get_output_path(self, input_path):
+    def poll_tesseract(self):
+        """Report the discovery result on the Tk thread once it is there"""
+        result = self.tesseract_result
+        if result is None:
+            self.root.after(100, self.poll_tesseract)
+            return
+        if self.startup_probe:
+            return  # measuring startup: no dialogs
+        if isinstance(result, Exception):
+            messagebox.showerror("Error", f"Tesseract validation failed: {str(result)}")
+            return
+        path, version = result
+        if path:
+            print(f"✅ Tesseract {version} found at: {path}")
+            return
+        messagebox.showwarning("Warning", 
+                             "Tesseract OCR not found. OCR functionality will not be available.\n\n"
+                             "Please install Tesseract for scanned PDF support:\n"
+                             "Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki\n"
+                             "macOS: brew install tesseract\n"
+                             "Linux: sudo apt-get install tesseract-ocr")
+
+    def load_engine(self):
+        """Import the conversion engine and start the job queue, on first use"""
+        if self.queue is None:
+            self.status_label.config(text="Loading conversion engine...")
+            self.root.update_idletasks()
+            import pdf_to_word_queue as job_queue
+            self.queue = job_queue.JobQueue(**(self.limits() or {}))
+        return self.queue
+
+    def get_output_path(self, input_path, reserved=None):
         """Generate output path that doesn't overwrite existing files"""
-        base, ext = os.path.splitext(input_path)
-        output_path = f"{base}.docx"
-        counter = 1
-        
-        while os.path.exists(output_path):
-            output_path = f"{base}_{counter}.docx"
-            counter += 1
-            
-        return output_path
-
-    def pdf_to_word_best(self, pdf_path, docx_path, conversion_mode="auto"):
-        """Convert PDF to DOCX with specified mode"""
-        if not os.path.exists(pdf_path):
-            print(f"❌ Error: PDF file not found: {pdf_path}")
-            return False
-        
-        # Remove existing output file
-        if os.path.exists(docx_path):
-            try:
-                os.remove(docx_path)
-            except Exception as e:
-                print(f"⚠️ Warning: Could not remove existing file: {e}")
-
-        doc = Document()
-
-        # Method 1: Try pdf2docx first (for auto and text-based modes)
-        if conversion_mode in ["auto", "text"]:
-            print("🔹 Trying pdf2docx...")
-            try:
-                cv = Converter(pdf_path)
-                cv.convert(docx_path, start=0, end=None)
-                cv.close()
-                print("✅ Converted using pdf2docx!")
-                return True
-            except Exception as e:
-                print(f"⚠️ pdf2docx failed: {e}")
-                if conversion_mode == "text":
-                    return False  # Text mode failed, don't try OCR
-
-        # Method 2: Use pdfplumber + OCR (for auto and ocr modes)
-        if conversion_mode in ["auto", "ocr"]:
-            print("🔹 Using OCR for scanned PDF...")
-            try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    for i, page in enumerate(pdf.pages):
-                        text = page.extract_text()
-
-                        # If no text found, use OCR
-                        if not text:
-                            print(f"🔹 Page {i+1}: No text found, using OCR...")
-                            
-                            # Convert page to image
-                            img = page.to_image(resolution=300).annotated
-                            img_path = f"temp_page_{i+1}.png"
-                            
-                            try:
-                                img.save(img_path)
-                                # Extract text using OCR
-                                text = pytesseract.image_to_string(Image.open(img_path))
-                                # Clean up temporary file
-                                os.remove(img_path)
-                            except Exception as e:
-                                print(f"⚠️ OCR failed for page {i+1}: {e}")
-                                text = f"[OCR failed for page {i+1}]"
-
-                        # Add text to document with formatting
-                        if text.strip():  # Only add non-empty paragraphs
-                            paragraph = doc.add_paragraph(text.strip())
-                            paragraph.style.font.size = Pt(12)
-
-                # Save final DOCX
-                doc.save(docx_path)
-                print(f"✅ OCR Conversion Successful: {docx_path}")
-                return True
-                
-            except Exception as e:
-                print(f"❌ Error during conversion: {e}")
-                return False
-        
-        return False
+        import pdf_to_word_engine as engine
+        return engine.get_output_path(input_path, reserved=reserved)
 
-    def convert_pdf(self, input_path, output_path, conversion_mode):
-        """Convert PDF to Word document in a separate thread"""
+    def limits(self):
+        """Concurrency limits from the spinboxes, or None while one is being edited by hand"""
         try:
-            success = self.pdf_to_word_best(input_path, output_path, conversion_mode)
-            self.root.after(0, self.conversion_finished, success, output_path)
-        except Exception as e:
-            self.root.after(0, self.conversion_error, str(e))
+            return {"ocr_slots": self.ocr_slots_var.get(), "text_slots": self.text_slots_var.get()}
+        except tk.TclError:
+            return None
 
-    def conversion_finished(self, success, output_path):
-        """Handle conversion completion"""
-        self.progress.stop()
+    def update_limits(self):
+        """Apply the concurrency spinboxes to jobs queued from now on"""
+        limits = self.limits()
+        if self.queue is not None and limits:
+            self.queue.set_limits(**limits)
+
+    def refresh_jobs(self):
+        """Show each job's state and progress in the job list"""
+        for job in self.queue.jobs:
+            iid = str(job.id)
+            event = job.progress
+            if job.state == "running" and event is not None and event.pages_total:
+                detail = f"{event.pages_done}/{event.pages_total} pages"
+                if event.pages_per_second:
+                    detail += f", {progress.format_eta(event.eta_seconds)} left"
+            elif job.state == "failed":
+                detail = job.error or ""
+            elif job.state == "done" and job.seconds is not None:
+                detail = f"{job.seconds:.1f}s"
+            else:
+                detail = ""
+            values = (os.path.basename(job.input), job.kind or "...", STATE_LABELS[job.state], detail)
+            if self.job_list.exists(iid):
+                self.job_list.item(iid, values=values)
+            else:
+                self.job_list.insert("", tk.END, iid=iid, values=values)
+
+    def poll_progress(self):
+        """Update the job list and overall progress on the Tk thread, every 200 ms while converting"""
+        if not self.converting:
+            return
+        self.queue.poll()
+        self.refresh_jobs()
+
+        # Overall progress: finished jobs count whole, running ones by their pages
+        done = 0.0
+        for job in self.batch:
+            if job.finished:
+                done += 1
+            elif job.progress is not None:
+                done += job.progress.fraction
+        self.progress.config(value=done / len(self.batch) * 100)
+
+        counts = self.queue.counts()
+        self.status_label.config(
+            text=f"Converting: {counts['running']} running, {counts['pending']} waiting, "
+                 f"{counts['done']} done, {counts['failed']} failed")
+
+        if all(job.finished for job in self.batch):
+            self.conversion_finished()
+            return
+        self.root.after(200, self.poll_progress)
+
+    def cancel_selected(self):
+        """Cancel the jobs selected in the job list"""
+        selected = set(self.job_list.selection())
+        for job in (self.queue.jobs if self.queue else []):
+            if str(job.id) in selected:
+                self.queue.cancel(job)
+
+    def cancel_conversion(self):
+        """Cancel every queued job; running ones stop at their next page"""
+        if self.converting:
+            self.queue.cancel_all()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.status_label.config(text="Cancelling after the current page...")
+
+    def clear_finished(self):
+        """Remove finished jobs from the job list"""
+        if self.queue is None:
+            return
+        for job in self.queue.jobs:
+            if job.finished and self.job_list.exists(str(job.id)):
+                self.job_list.delete(str(job.id))
+        self.queue.clear_finished()
+
+    def end_conversion(self):
+        """Hide the progress bar and re-enable the Convert button"""
+        self.converting = False
+        self.refresh_jobs()
         self.progress.pack_forget()
+        self.cancel_btn.config(state=tk.NORMAL)
         self.convert_btn.config(state=tk.NORMAL)
-        
-        if success:
-            self.status_label.config(text="✅ Conversion completed successfully!")
-            result = messagebox.askyesno("Success", 
-                                       f"PDF converted successfully!\n\n"
-                                       f"Output: {output_path}\n\n"
-                                       "Would you like to open the output folder?")
-            if result:
-                self.open_output_folder(output_path)
-        else:
-            self.status_label.config(text="❌ Conversion failed!")
-            messagebox.showerror("Error", "Failed to convert PDF. Please check the file and try again.")
 
-    def conversion_error(self, error_message):
-        """Handle conversion errors"""
-        self.progress.stop()
-        self.progress.pack_forget()
-        self.convert_btn.config(state=tk.NORMAL)
-        self.status_label.config(text="❌ Conversion failed!")
-        messagebox.showerror("Error", f"An error occurred during conversion:\n\n{error_message}")
+    def conversion_finished(self):
+        """Handle completion of the whole batch"""
+        self.end_conversion()
+        jobs = self.batch
+        done = [job for job in jobs if job.state == "done"]
+        failed = [job for job in jobs if job.state == "failed"]
+        cancelled = len(jobs) - len(done) - len(failed)
+
+        if len(jobs) == 1:
+            job = jobs[0]
+            if job.state == "done":
+                self.status_label.config(text="✅ Conversion completed successfully!")
+                result = messagebox.askyesno("Success", 
+                                           f"PDF converted successfully!\n\n"
+                                           f"Output: {job.output}\n\n"
+                                           "Would you like to open the output folder?")
+                if result:
+                    self.open_output_folder(job.output)
+            elif job.state == "cancelled":
+                self.status_label.config(text="⏹️ Conversion cancelled")
+            else:
+                self.status_label.config(text="❌ Conversion failed!")
+                messagebox.showerror("Error", f"An error occurred during conversion:\n\n{job.error}")
+            return
+
+        self.status_label.config(
+            text=f"✅ {len(done)} converted, ❌ {len(failed)} failed, ⏹️ {cancelled} cancelled")
+        summary = f"{len(done)} of {len(jobs)} PDFs converted."
+        if failed:
+            summary += "\n\nFailed:\n" + "\n".join(
+                f"{os.path.basename(job.input)}: {job.error}" for job in failed[:10])
+        if done:
+            if messagebox.askyesno("Batch Finished", summary + "\n\nWould you like to open the output folder?"):
+                self.open_output_folder(done[0].output)
+        else:
+            messagebox.showwarning("Batch Finished", summary)
 
     def open_output_folder(self, output_path):
         """Open the output folder in file explorer"""
@@ -280,19 +399,23 @@ class PDFToWordConverter:
                 messagebox.showerror("Error", f"Could not open folder: {e}")
 
     def start_conversion(self):
-        input_path = self.input_entry.get().strip()
+        input_paths = self.selected_files
+        typed = self.input_entry.get().strip()
+        if len(input_paths) <= 1:
+            # A single path may have been typed or pasted in
+            input_paths = [typed] if typed else []
         
-        if not input_path:
+        if not input_paths:
             messagebox.showwarning("Warning", "Please select a PDF file first.")
             return
 
-        if not os.path.isfile(input_path):
-            messagebox.showwarning("Warning", "The specified file does not exist.")
-            return
-
-        if not input_path.lower().endswith('.pdf'):
-            messagebox.showwarning("Warning", "Please select a valid PDF file.")
-            return
+        for input_path in input_paths:
+            if not os.path.isfile(input_path):
+                messagebox.showwarning("Warning", f"The specified file does not exist:\n{input_path}")
+                return
+            if not input_path.lower().endswith('.pdf'):
+                messagebox.showwarning("Warning", f"Please select a valid PDF file:\n{input_path}")
+                return
 
         # Get conversion mode
         conversion_mode_map = {
@@ -302,30 +425,65 @@ class PDFToWordConverter:
         }
         conversion_mode = conversion_mode_map.get(self.conversion_var.get(), "auto")
 
-        # Generate output path
-        output_path = self.get_output_path(input_path)
-        
-        # Check if output file already exists
-        if os.path.exists(output_path):
-            result = messagebox.askyesno("File Exists", 
-                                       f"Output file already exists:\n{output_path}\n\n"
-                                       "Do you want to overwrite it?")
-            if not result:
+        self.load_engine()
+        self.update_limits()
+
+        # Output names that don't overwrite existing files or each other,
+        # including outputs of jobs still in the queue
+        reserved = {job.output for job in self.queue.jobs if not job.finished}
+        self.batch = []
+        for input_path in input_paths:
+            output_path = self.get_output_path(input_path, reserved=reserved)
+            reserved.add(output_path)
+            self.batch.append(self.queue.add(input_path, output_path, conversion_mode))
+
+        # Show progress and start polling the queue
+        self.converting = True
+        self.progress.config(value=0)
+        self.progress.pack(pady=5, before=self.status_label)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.convert_btn.config(state=tk.DISABLED)
+        self.status_label.config(text=f"Queued {len(self.batch)} PDF(s)...")
+        self.refresh_jobs()
+        self.root.after(200, self.poll_progress)
+
+    def on_close(self):
+        """Stop queued and running conversions, then close the window"""
+        if self.queue is not None:
+            if self.queue.active() and not messagebox.askyesno(
+                    "Quit", "Conversions are still running. Cancel them and quit?"):
                 return
+            self.queue.shutdown()
+        self.root.destroy()
 
-        # Show progress and start conversion
-        self.progress.pack(pady=10)
-        self.progress.start()
-        self.convert_btn.config(state=tk.DISABLED)
-        self.status_label.config(text="Converting PDF...")
+    def report_startup(self, probe_file):
+        """Write startup timings for benchmarks/bench_startup.py, then quit
+
+        Records when the window was drawn and when Tesseract discovery
+        finished (wall-clock, so the caller can subtract its launch time),
+        and which heavy libraries had been loaded by then.
+        """
+        self.startup_probe = probe_file
         self.root.update()
-        
-        # Start conversion in separate thread
-        thread = threading.Thread(target=self.convert_pdf, args=(input_path, output_path, conversion_mode))
-        thread.daemon = True
-        thread.start()
+        ready = time.time()
+
+        def finish():
+            if self.tesseract_result is None:
+                self.root.after(10, finish)
+                return
+            with open(probe_file, "w", encoding="utf-8") as f:
+                json.dump({"ready": ready, "tesseract": time.time(),
+                           "tesseract_found": isinstance(self.tesseract_result, tuple)
+                                              and self.tesseract_result[0] is not None,
+                           "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules]}, f)
+            self.root.destroy()
+
+        finish()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # conversions run in worker processes, also when frozen
     root = tk.Tk()
     app = PDFToWordConverter(root)
+    if os.environ.get("PDF_TO_WORD_STARTUP_PROBE"):
+        app.report_startup(os.environ["PDF_TO_WORD_STARTUP_PROBE"])
     root.mainloop() 
\ No newline at end of file
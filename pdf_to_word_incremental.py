@@ -0,0 +1,85 @@
+"""
+Incremental re-conversion for PDF to Word Converter
+Keeps every converted page's output keyed by the page's own content, so a revised PDF only re-converts the pages that changed
+"""
+
+import json
+
+import pdf_to_word_cache as cache_store
+
+
+class PageHistory:
+    """Per-page outputs of earlier conversions, looked up by page fingerprint
+
+    Each page is stored under its fingerprint (see PDFSource.page_fingerprint)
+    and the conversion settings: a pdf2docx page as its stored layout, a
+    text or OCR page as its text. A page whose fingerprint was seen before,
+    in this PDF or an earlier revision of it, is taken from store instead of
+    being converted again. It answers the same questions as a PageJournal,
+    so the engine can use it in the journal's place; with a journal, pages
+    are still recorded there too.
+    """
+
+    def __init__(self, store, fingerprints, settings, journal=None):
+        self.store = store
+        self.keys = [cache_store.make_key(fp, settings) for fp in fingerprints]
+        self.journal = journal
+        self.reused = set()
+        self._entries = {}
+
+    def _entry(self, index):
+        """The stored entry for a page, or None; read from store once"""
+        if index not in self._entries:
+            entry = None
+            if self.journal is not None and index in self.journal:
+                entry = self.journal.pages[index]
+            else:
+                data = self.store.read(self.keys[index])
+                if data is not None:
+                    try:
+                        entry = json.loads(data)
+                    except ValueError:
+                        entry = None  # Cut short by a crash; convert the page again
+            self._entries[index] = entry
+        return self._entries[index]
+
+    def __contains__(self, index):
+        entry = self._entry(index)
+        return entry is not None and "text" in entry
+
+    def route(self, index):
+        """How a page was converted: "text" or "ocr" """
+        return self._entry(index)["route"]
+
+    def text(self, index):
+        """Stored text of a page, or None if it has none"""
+        entry = self._entry(index)
+        if entry is None or "text" not in entry:
+            return None
+        self.reused.add(index)
+        return entry["text"]
+
+    def layout(self, index):
+        """Stored pdf2docx layout of a page (for Converter.restore), or None"""
+        entry = self._entry(index)
+        if entry is None or "layout" not in entry:
+            return None
+        self.reused.add(index)
+        return dict(entry["layout"], id=index)
+
+    def record(self, index, route, text, **details):
+        """Keep a converted page's text; route is "text" or "ocr" """
+        if self.journal is not None:
+            self.journal.record(index, route, text, **details)
+        self._save(index, {"route": route, "text": text, **details})
+
+    def record_layout(self, index, stored):
+        """Keep a page parsed by pdf2docx, as returned by Page.store()"""
+        self._save(index, {"route": "layout", "layout": stored})
+
+    def _save(self, index, entry):
+        self._entries[index] = entry
+        try:
+            self.store.write(self.keys[index], json.dumps(entry).encode("utf-8"))
+        except Exception as e:
+            print(f"⚠️ Warning: Could not store page {index + 1} for incremental runs: {e}")
@@ -0,0 +1,93 @@
+"""
+Page journal for PDF to Word Converter
+Records each finished page of a conversion on disk, so an interrupted job resumes where it stopped
+"""
+
+import json
+import os
+
+# Bump when the journal's line layout changes; older journals are then ignored
+JOURNAL_FORMAT = 1
+
+
+class PageJournal:
+    """Append-only record of the pages one conversion has finished
+
+    One JSON line per page (its route and text, plus details such as how
+    OCR went), flushed as soon as the page is done. The file is named after
+    key, which covers the PDF's bytes and the conversion settings, so only a
+    rerun of the same input with the same settings picks it up. A line cut
+    short by a crash is dropped when the journal is reopened.
+    """
+
+    def __init__(self, journal_dir, key):
+        self.path = os.path.join(os.path.abspath(journal_dir), key + ".jsonl")
+        self.key = key
+        self.pages = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        good_bytes = self._load()
+        self._file = open(self.path, "ab")
+        if self._file.tell() != good_bytes:
+            self._file.truncate(good_bytes)
+            self._file.seek(good_bytes)
+        if not good_bytes:
+            self._write({"format": JOURNAL_FORMAT, "key": key})
+
+    def _load(self):
+        """Read the pages recorded so far; returns the length of the intact part"""
+        good_bytes = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    if good_bytes == 0:
+                        if entry.get("format") != JOURNAL_FORMAT or entry.get("key") != self.key:
+                            break
+                    else:
+                        self.pages[entry["page"] - 1] = entry
+                    good_bytes += len(line)
+        except FileNotFoundError:
+            pass
+        return good_bytes
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry).encode("utf-8") + b"\n")
+        # Out of Python's buffer, so it survives the process being killed
+        self._file.flush()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, index):
+        return index in self.pages
+
+    def route(self, index):
+        """How a recorded page was converted: "text" or "ocr" """
+        return self.pages[index]["route"]
+
+    def text(self, index):
+        """Recorded text of a page, or None if it isn't finished"""
+        entry = self.pages.get(index)
+        return entry["text"] if entry else None
+
+    def record(self, index, route, text, **details):
+        """Note that a page is finished: route is "text" or "ocr" """
+        entry = {"page": index + 1, "route": route, "text": text, **details}
+        self._write(entry)
+        self.pages[index] = entry
+
+    def close(self, remove=False):
+        """Close the file; remove=True deletes the journal (the job is done)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
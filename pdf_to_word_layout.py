@@ -0,0 +1,87 @@
+"""
+Layout-preserving (pdf2docx) stage for PDF to Word Converter
+Parses page ranges in parallel worker processes and merges them into one document
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf2docx import Converter
+from pdf2docx.converter import ConversionException
+
+# Pages parsed per worker task when converting in chunks
+DEFAULT_CHUNK_SIZE = 25
+
+
+def chunk_pages(pages, chunk_size):
+    """Split a list of page indexes into consecutive runs of at most chunk_size"""
+    chunk_size = max(1, chunk_size)
+    return [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+
+
+def _parse_chunk(job):
+    """Worker entry point: parse a page range and return pdf2docx's stored layouts"""
+    pdf_path, password, pages, settings = job
+    cv = Converter(pdf_path, password)
+    try:
+        cv.parse(pages=pages, **settings)
+        return [cv.pages[i].store() for i in pages if cv.pages[i].finalized]
+    finally:
+        cv.close()
+
+
+def _parse_pages(cv, settings, on_pages):
+    """Converter.parse_pages, calling on_pages(1) after each page"""
+    for page in [page for page in cv.pages if not page.skip_parsing]:
+        try:
+            page.parse(**settings)
+        except Exception as e:
+            if settings["raw_exceptions"]:
+                raise
+            if not settings["debug"] and settings["ignore_page_error"]:
+                logging.error("Ignore page %d due to parsing page error: %s", page.id + 1, e)
+            else:
+                raise ConversionException(f"Error when parsing page {page.id + 1}: {e}")
+        on_pages(1)
+
+
+def parse_into(cv, pdf_path, pages, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, on_pages=None):
+    """Parse the given pages into an open Converter, in chunks when workers > 1
+
+    Each chunk is parsed by an independent Converter in a worker process
+    (as pdf2docx's own multi-processing does, but with no JSON files in the
+    working directory and a configurable chunk size). The stored layouts are
+    restored into cv, so make_docx/Page.make_docx work as after cv.parse().
+    on_pages(n) is called as pages finish (per page, or per chunk with
+    workers); if it raises, parsing stops and chunks not yet started are dropped.
+    """
+    settings = cv.default_settings
+    chunks = chunk_pages(list(pages), chunk_size)
+    if workers <= 1 or len(chunks) <= 1:
+        if on_pages is None:
+            cv.parse(pages=pages, **settings)
+        else:
+            cv.load_pages(pages=list(pages)).parse_document(**settings)
+            _parse_pages(cv, settings, on_pages)
+        return
+
+    print(f"🔹 pdf2docx: {len(chunks)} chunk(s) of up to {chunk_size} page(s) "
+          f"on {min(workers, len(chunks))} worker(s)...")
+    jobs = [(pdf_path, cv.password, chunk, settings) for chunk in chunks]
+    stored = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        try:
+            for chunk, result in zip(chunks, pool.map(_parse_chunk, jobs)):
+                stored.extend(result)
+                if on_pages is not None:
+                    on_pages(len(chunk))
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    cv.restore({"page_cnt": len(cv.fitz_doc), "pages": stored})
+
+
+def convert_layout(cv, pdf_path, docx_path, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert every page with pdf2docx; the single-worker case matches Converter.convert"""
+    parse_into(cv, pdf_path, range(len(cv.fitz_doc)), workers, chunk_size)
+    cv.make_docx(docx_path, **cv.default_settings)
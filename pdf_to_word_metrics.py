@@ -0,0 +1,262 @@
+"""
+Instrumentation for PDF to Word Converter
+Per-job and per-page stage timings, JSON log lines and Prometheus text metrics
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stages a conversion's time is split into. Page-level stages (render,
+# preprocess, ocr) are summed over pages, so with several OCR workers they can
+# add up to more than the job's wall time. "screen" is the blank and
+# duplicate check that runs before OCR.
+STAGES = ("open", "triage", "extract_text", "screen", "render", "preprocess", "ocr", "layout",
+          "save")
+
+# Upper bounds (seconds) of the job and page duration histogram buckets
+JOB_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+PAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class JobMetrics:
+    """Timings and page routes of a single conversion
+
+    The engine fills one of these as it goes; as_dict() is plain data, so it
+    can be returned from a worker process and recorded by the parent.
+    """
+
+    def __init__(self, input_path=None, mode=None):
+        self.input = input_path
+        self.mode = mode
+        self.stages = {}
+        self.pages = []
+        self.cache = None
+        self.success = None
+        self.error = None
+        self.seconds = None
+        # Highest RSS of the converting process seen at a page boundary
+        self.peak_rss_bytes = None
+        # {"reused": n, "recomputed": m} pages of an incremental conversion
+        self.incremental = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block and add it to the named stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def page(self, index, route, seconds=None, failed=False, **details):
+        """Record how one page was converted: route is "layout", "text" or "ocr"
+
+        OCR pages also say whether they came from the page cache (cache_hit)
+        and whether OCR was skipped as "blank" or "duplicate" (skipped).
+        """
+        self.pages.append({"page": index + 1, "route": route, "seconds": seconds,
+                           "failed": failed, **details})
+
+    def finish(self, success):
+        self.success = bool(success)
+        self.seconds = time.perf_counter() - self._started
+
+    def as_dict(self):
+        return {
+            "input": self.input,
+            "mode": self.mode,
+            "success": self.success,
+            "error": self.error,
+            "seconds": self.seconds,
+            "cache": self.cache,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "skipped_pages": self.skipped_pages,
+            "incremental": self.incremental,
+            "stages": dict(self.stages),
+            "pages": sorted(self.pages, key=lambda p: p["page"]),
+        }
+
+    @property
+    def skipped_pages(self):
+        """Pages that skipped OCR, by reason ("blank", "duplicate")"""
+        counts = {}
+        for page in self.pages:
+            if page.get("skipped"):
+                counts[page["skipped"]] = counts.get(page["skipped"], 0) + 1
+        return counts
+
+
+class JsonLogWriter:
+    """Append one JSON object per line: a "page" event per page, then a "job" event"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write_job(self, job):
+        now = time.time()
+        base = {"ts": now, "input": job["input"], "mode": job["mode"]}
+        lines = [json.dumps({"event": "page", **base, **page}) for page in job["pages"]]
+        summary = {k: v for k, v in job.items() if k != "pages"}
+        summary["page_count"] = len(job["pages"])
+        summary["failed_pages"] = sum(1 for p in job["pages"] if p["failed"])
+        lines.append(json.dumps({"event": "job", "ts": now, **summary}))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """Process-wide totals over recorded jobs, rendered as Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jobs = {}           # (mode, outcome) -> count
+        self.pages = {}          # route -> count
+        self.page_failures = {}  # route -> count
+        self.stage_seconds = {}  # stage -> seconds
+        self.cache = {}          # "hit"/"miss" -> count
+        self.skipped = {}        # "blank"/"duplicate" -> pages that skipped OCR
+        self.incremental = {}    # "reused"/"recomputed" -> pages of incremental conversions
+        self.job_seconds = Histogram(JOB_BUCKETS)
+        self.page_seconds = {}   # route -> Histogram
+
+    def record(self, job):
+        """Add a finished job (a JobMetrics.as_dict()) to the totals"""
+        with self._lock:
+            key = (job["mode"], "success" if job["success"] else "failure")
+            self.jobs[key] = self.jobs.get(key, 0) + 1
+            if job["seconds"] is not None:
+                self.job_seconds.observe(job["seconds"])
+            if job["cache"]:
+                self.cache[job["cache"]] = self.cache.get(job["cache"], 0) + 1
+            for reason, count in job.get("skipped_pages", {}).items():
+                self.skipped[reason] = self.skipped.get(reason, 0) + count
+            for result, count in (job.get("incremental") or {}).items():
+                self.incremental[result] = self.incremental.get(result, 0) + count
+            for stage, seconds in job["stages"].items():
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            for page in job["pages"]:
+                route = page["route"]
+                self.pages[route] = self.pages.get(route, 0) + 1
+                if page["failed"]:
+                    self.page_failures[route] = self.page_failures.get(route, 0) + 1
+                if page["seconds"] is not None:
+                    self.page_seconds.setdefault(route, Histogram(PAGE_BUCKETS)).observe(page["seconds"])
+
+    def render(self):
+        """The totals in Prometheus text exposition format"""
+        out = []
+
+        def metric(name, kind, help_text, samples):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(samples)
+
+        def histogram(name, hist, **labels):
+            samples = []
+            for bound, count in zip(hist.buckets, hist.counts):
+                samples.append(f"{name}_bucket{_labels(**labels, le=f'{bound:g}')} {count}")
+            samples.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+            suffix = _labels(**labels) if labels else ""
+            samples.append(f"{name}_sum{suffix} {hist.sum:.6f}")
+            samples.append(f"{name}_count{suffix} {hist.count}")
+            return samples
+
+        with self._lock:
+            metric("pdf_to_word_jobs_total", "counter", "Conversions by mode and outcome",
+                   [f"pdf_to_word_jobs_total{_labels(mode=m, outcome=o)} {n}"
+                    for (m, o), n in sorted(self.jobs.items())])
+            metric("pdf_to_word_job_seconds", "histogram", "Wall time per conversion",
+                   histogram("pdf_to_word_job_seconds", self.job_seconds))
+            metric("pdf_to_word_pages_total", "counter", "Pages converted by route",
+                   [f"pdf_to_word_pages_total{_labels(route=r)} {n}"
+                    for r, n in sorted(self.pages.items())])
+            metric("pdf_to_word_page_failures_total", "counter", "Pages that failed by route",
+                   [f"pdf_to_word_page_failures_total{_labels(route=r)} {n}"
+                    for r, n in sorted(self.page_failures.items())])
+            metric("pdf_to_word_pages_skipped_total", "counter",
+                   "Scanned pages that skipped OCR as blank or duplicate",
+                   [f"pdf_to_word_pages_skipped_total{_labels(reason=r)} {n}"
+                    for r, n in sorted(self.skipped.items())])
+            metric("pdf_to_word_incremental_pages_total", "counter",
+                   "Pages of incremental conversions reused from earlier runs or recomputed",
+                   [f"pdf_to_word_incremental_pages_total{_labels(result=r)} {n}"
+                    for r, n in sorted(self.incremental.items())])
+            page_samples = []
+            for route, hist in sorted(self.page_seconds.items()):
+                page_samples += histogram("pdf_to_word_page_seconds", hist, route=route)
+            metric("pdf_to_word_page_seconds", "histogram", "Time per page by route", page_samples)
+            metric("pdf_to_word_stage_seconds_total", "counter",
+                   "Time spent per pipeline stage (page stages summed over pages)",
+                   [f"pdf_to_word_stage_seconds_total{_labels(stage=s)} {v:.6f}"
+                    for s, v in sorted(self.stage_seconds.items())])
+            metric("pdf_to_word_cache_lookups_total", "counter", "Result cache lookups",
+                   [f"pdf_to_word_cache_lookups_total{_labels(result=r)} {n}"
+                    for r, n in sorted(self.cache.items())])
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically (re)write the metrics file, e.g. for node_exporter's textfile collector"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def serve_metrics(registry, port, host="127.0.0.1"):
+    """Serve registry.render() at http://host:port/metrics from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep scrapes out of the conversion log
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,426 @@
+"""
+OCR stage for PDF to Word Converter
+Renders scanned pages and runs Tesseract on them, serially or across a process pool
+"""
+
+import dataclasses
+import functools
+import hashlib
+import multiprocessing.util
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pytesseract
+import pdf_to_word_cache as cache_store
+import pdf_to_word_preprocess as preprocessing
+import pdf_to_word_source as source
+
+# Resolution scanned pages are rendered at before OCR
+OCR_RESOLUTION = 300
+
+# How page rasters reach Tesseract: "memory" pipes the raw pixel buffer,
+# "spill" parks it in a private temp directory so the render can be freed first
+RASTER_MODES = ("memory", "spill")
+
+# OCR engines; "auto" uses tesserocr when it is installed, else the executable
+OCR_BACKENDS = ("auto", "tesserocr", "cli")
+
+
+@dataclass
+class OCRSettings:
+    """How scanned pages are rendered and read; everything here can change the text"""
+    # Render resolution (the fixed one, or the fallback when adaptive)
+    resolution: int = OCR_RESOLUTION
+    # Tesseract language(s), e.g. "eng" or "eng+deu" (None = Tesseract's default)
+    lang: str = None
+    # Pick the resolution per page from page size and estimated text size
+    adaptive_resolution: bool = False
+    # "none" (grayscale render as-is), "gray" or "binary"; see pdf_to_word_preprocess
+    preprocess: str = "none"
+    # Straighten slightly rotated scans (with gray/binary preprocessing)
+    deskew: bool = False
+    # Which OCR engine reads the pages, see OCR_BACKENDS
+    backend: str = "auto"
+
+
+# Open PDFSource kept by each OCR worker process: (path, mtime, size) -> source
+_worker_sources = {}
+
+# Page-text caches opened by each OCR worker process, keyed by directory
+_worker_page_caches = {}
+
+# OCR backends created in this process, keyed by (backend, lang)
+_backends = {}
+
+# Long-lived OCR process pools, keyed by (workers, tesseract_cmd)
+_pools = {}
+
+
+@functools.lru_cache(maxsize=None)
+def tesseract_version():
+    """Version string of the configured Tesseract, looked up once per process"""
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return None
+
+
+def page_fingerprint(gray):
+    """SHA-256 of a rendered page's pixels and size (an 8-bit grayscale array)"""
+    height, width = gray.shape
+    digest = hashlib.sha256(f"L:{width}x{height}:".encode("ascii"))
+    digest.update(np.ascontiguousarray(gray))
+    return digest.hexdigest()
+
+
+def page_cache_key(img, settings, backend):
+    """Cache key for the OCR text of a rendered page under the given settings"""
+    return cache_store.make_key(page_fingerprint(img), {
+        "kind": "page-ocr",
+        "ocr": dataclasses.asdict(settings),
+        "engine": backend.name,
+        "tesseract": backend.version,
+    })
+
+
+def run_tesseract(input_name, data=None, lang=None):
+    """Run the Tesseract executable with its text on stdout
+
+    input_name is a file path, or "stdin" with the image bytes in data.
+    """
+    cmd = [pytesseract.pytesseract.tesseract_cmd, input_name, "stdout"]
+    if lang:
+        cmd += ["-l", lang]
+    try:
+        proc = subprocess.Popen(cmd, **pytesseract.pytesseract.subprocess_args())
+    except FileNotFoundError:
+        raise pytesseract.TesseractNotFoundError()
+    out, err = proc.communicate(data)
+    if proc.returncode:
+        raise pytesseract.TesseractError(proc.returncode, err.decode("utf-8", "replace").strip())
+    return out.decode("utf-8")
+
+
+def pgm_header(gray):
+    height, width = gray.shape
+    return b"P5\n%d %d\n255\n" % (width, height)
+
+
+def pgm_bytes(gray):
+    """Binary PGM of an 8-bit grayscale array: a short header, then the pixels
+
+    The pixels are copied once, straight into the output buffer.
+    """
+    header = pgm_header(gray)
+    data = bytearray(len(header) + gray.size)
+    data[:len(header)] = header
+    np.frombuffer(data, np.uint8, offset=len(header)).reshape(gray.shape)[...] = gray
+    return data
+
+
+def image_to_text(gray, lang=None):
+    """OCR a grayscale page array without touching the disk
+
+    The pixels go to Tesseract over a pipe as uncompressed PGM, so there is
+    no image encode/decode and nothing to clean up afterwards.
+    """
+    return run_tesseract("stdin", pgm_bytes(gray), lang)
+
+
+class CLIBackend:
+    """Starts the Tesseract executable for every page (pytesseract's approach)
+
+    Always available when Tesseract is installed; the fallback for the
+    resident backend below.
+    """
+    name = "cli"
+
+    def __init__(self, lang=None):
+        self.lang = lang
+        self.version = tesseract_version()
+
+    def image_to_text(self, gray):
+        return image_to_text(gray, self.lang)
+
+    def file_to_text(self, path):
+        return run_tesseract(path, lang=self.lang)
+
+
+class TesserocrBackend:
+    """One resident Tesseract engine per process through the C API (tesserocr)
+
+    The language model is loaded once and reused for every page, so short
+    pages no longer pay for process start-up and model loading.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang=None):
+        import tesserocr
+
+        kwargs = {"lang": lang or "eng"}
+        # Next to a Windows install, the models live beside tesseract.exe
+        tessdata = os.path.join(os.path.dirname(pytesseract.pytesseract.tesseract_cmd), "tessdata")
+        if os.path.isabs(tessdata) and os.path.isdir(tessdata):
+            kwargs["path"] = tessdata
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+        self.version = tesserocr.tesseract_version().split()[1]
+
+    def image_to_text(self, gray):
+        # Raw pixels, one byte each: no PIL image for tesserocr to re-encode
+        height, width = gray.shape
+        self._api.SetImageBytes(np.ascontiguousarray(gray).tobytes(), width, height, 1, width)
+        return self._api.GetUTF8Text()
+
+    def file_to_text(self, path):
+        self._api.SetImageFile(path)
+        return self._api.GetUTF8Text()
+
+
+def get_backend(name="auto", lang=None):
+    """The OCR backend for this process, created on first use and then reused"""
+    key = (name, lang)
+    backend = _backends.get(key)
+    if backend is None:
+        if name in ("auto", "tesserocr"):
+            try:
+                backend = TesserocrBackend(lang)
+            except Exception as e:
+                if name == "tesserocr":
+                    raise
+                print(f"🔹 tesserocr not available ({e}), using the Tesseract executable")
+                backend = CLIBackend(lang)
+        else:
+            backend = CLIBackend(lang)
+        _backends[key] = backend
+    return backend
+
+
+def ocr_page(page, page_number, settings=None, spill_dir=None, page_cache=None, timings=None):
+    """Render one page (a pdf_to_word_source.SourcePage) and return its OCR text
+
+    The page is rendered straight to an 8-bit grayscale NumPy array, which
+    goes through preprocessing and to the OCR backend without any PIL image.
+    With spill_dir set the raster is written there and released before
+    Tesseract runs, for hosts where a 300 DPI render is too much to hold.
+    With a page_cache (a ConversionCache), pages rendered identically before
+    reuse their stored text instead of running Tesseract. A timings dict is
+    filled with the seconds spent rendering, preprocessing and in OCR, plus
+    "failed" and "cache_hit" flags.
+    """
+    settings = settings or OCRSettings()
+    timings = {} if timings is None else timings
+    timings.update(failed=False, cache_hit=False)
+    try:
+        backend = get_backend(settings.backend, settings.lang)
+        started = time.perf_counter()
+        resolution = settings.resolution
+        if settings.adaptive_resolution:
+            resolution = preprocessing.choose_resolution(page, default=resolution)
+
+        # Convert page to image
+        img = page.render_gray(resolution)
+        timings["render"] = time.perf_counter() - started
+
+        key = None
+        if page_cache is not None:
+            key = page_cache_key(img, settings, backend)
+            cached = page_cache.read(key)
+            if cached is not None:
+                timings["cache_hit"] = True
+                return cached.decode("utf-8")
+
+        started = time.perf_counter()
+        img = preprocessing.preprocess(img, settings.preprocess, settings.deskew)
+        timings["preprocess"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if spill_dir is None:
+            text = backend.image_to_text(img)
+        else:
+            img_path = os.path.join(spill_dir, f"page_{page_number}.pgm")
+            with open(img_path, "wb") as f:
+                f.write(pgm_header(img))
+                img.tofile(f)
+            del img
+            try:
+                text = backend.file_to_text(img_path)
+            finally:
+                os.remove(img_path)
+        timings["ocr"] = time.perf_counter() - started
+    except Exception as e:
+        print(f"⚠️ OCR failed for page {page_number}: {e}")
+        timings["failed"] = True
+        return f"[OCR failed for page {page_number}]"
+
+    if key is not None:
+        try:
+            page_cache.write(key, text.encode("utf-8"))
+        except Exception as e:
+            print(f"⚠️ Warning: Could not cache OCR text for page {page_number}: {e}")
+    return text
+
+
+def screen_pages(source, page_indexes, blank_ink=preprocessing.BLANK_PAGE_INK,
+                 duplicate_change=preprocessing.DUPLICATE_PAGE_CHANGE, resolution=None):
+    """Find the pages of an open PDFSource that don't need OCR
+
+    Each page is rendered at PREVIEW_RESOLUTION and judged on its pixel
+    statistics: less than blank_ink of it inked makes it a blank candidate,
+    less than duplicate_change of it changed from the page right before it
+    (also in page_indexes) a duplicate candidate. With resolution (the OCR
+    resolution), candidates are confirmed on a render at it: a blank page
+    must have no ink at all, a duplicate must be pixel-identical to its
+    original (the fingerprint the page cache keys OCR text by). Returns a
+    dict mapping page index to ("blank", None) or ("duplicate", index of the
+    page whose OCR text it reuses); a threshold of 0 turns that check off.
+    """
+    fingerprints = {}
+
+    def full_render(i):
+        gray = source.render_gray(i, resolution)
+        source.page_done()
+        return gray
+
+    def fingerprint(i):
+        if i not in fingerprints:
+            fingerprints[i] = page_fingerprint(full_render(i))
+        return fingerprints[i]
+
+    skipped = {}
+    previous = previous_index = None
+    for i in page_indexes:
+        gray = source.render_gray(i, preprocessing.PREVIEW_RESOLUTION)
+        source.page_done()
+        if previous_index != i - 1:
+            previous = None
+        if preprocessing.ink_ratio(gray) < blank_ink:
+            if resolution is None or preprocessing.ink_ratio(full_render(i)) == 0:
+                skipped[i] = ("blank", None)
+                print(f"🔹 Page {i+1}: blank, skipping OCR")
+        elif preprocessing.changed_ratio(gray, previous) < duplicate_change:
+            # A run of duplicates all point at the page before the run
+            reason, original = skipped.get(i - 1, (None, None))
+            original = original if reason == "duplicate" else i - 1
+            if resolution is None or fingerprint(i) == fingerprint(original):
+                skipped[i] = ("duplicate", original)
+                print(f"🔹 Page {i+1}: same as page {original+1}, reusing its OCR text")
+        previous, previous_index = gray, i
+    return skipped
+
+
+def _init_worker(tesseract_cmd):
+    """Give each worker process the parent's Tesseract location"""
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_page_job(job):
+    """Worker entry point: OCR page index of pdf_path, reusing the open PDF
+
+    Returns (text, cache_hit, timings) where cache_hit is None without a
+    page cache and timings is ocr_page's.
+    """
+    pdf_path, index, settings, spill_dir, cache_spec = job
+    st = os.stat(pdf_path)
+    pdf_key = (pdf_path, st.st_mtime, st.st_size)
+    pdf = _worker_sources.get(pdf_key)
+    if pdf is None:
+        # The pool outlives documents: keep only the current one open
+        for old in _worker_sources.values():
+            old.close()
+        _worker_sources.clear()
+        pdf = _worker_sources[pdf_key] = source.PDFSource(pdf_path)
+
+    page_cache = None
+    if cache_spec:
+        cache_dir, max_bytes = cache_spec
+        page_cache = _worker_page_caches.get(cache_dir)
+        if page_cache is None:
+            page_cache = _worker_page_caches[cache_dir] = cache_store.ConversionCache(
+                cache_dir, max_bytes, suffix=".txt")
+        hits_before = page_cache.hits
+
+    timings = {}
+    try:
+        text = ocr_page(pdf.page(index), index + 1, settings, spill_dir, page_cache, timings)
+    finally:
+        # Let go of the page so long documents don't pile up in the worker
+        pdf.page_done()
+    return text, (page_cache.hits > hits_before if page_cache else None), timings
+
+
+def get_pool(workers):
+    """A process pool of OCR workers that stays up between documents
+
+    Workers keep their OCR backend (and with tesserocr, the loaded model)
+    for the life of the pool instead of starting over for every file.
+    """
+    key = (workers, pytesseract.pytesseract.tesseract_cmd)
+    pool = _pools.get(key)
+    if pool is None:
+        if not _pools:
+            # Also stop them when this is itself a worker process, where
+            # atexit handlers (and so concurrent.futures' own cleanup) don't run
+            multiprocessing.util.Finalize(None, shutdown_pools, exitpriority=100)
+        pool = _pools[key] = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                 initargs=(key[1],))
+    return pool
+
+
+def shutdown_pools():
+    """Stop the long-lived OCR worker processes"""
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+def ocr_pages(pdf_path, page_indexes, workers, settings=None, spill_dir=None, page_cache=None,
+              batch_size=None, page_timings=None, on_page=None):
+    """OCR several pages of one PDF on the long-lived process pool
+
+    Pages are handed out in batches of batch_size (by default, enough for
+    about four batches per worker). Returns a dict mapping page index to OCR
+    text, so the caller can put the results back in page order however the
+    pool scheduled them. Workers open their own view of page_cache; its
+    hit/miss counters are updated here. page_timings, if given, is filled
+    with each page's ocr_page timings by index. on_page(index, text, timings)
+    is called as each page's result comes in; if it raises, pages not yet
+    started are dropped.
+    """
+    texts = {}
+    for index, text, timings in iter_ocr_pages(pdf_path, page_indexes, workers, settings,
+                                               spill_dir, page_cache, batch_size):
+        texts[index] = text
+        if page_timings is not None:
+            page_timings[index] = timings
+        if on_page is not None:
+            on_page(index, text, timings)
+    return texts
+
+
+def iter_ocr_pages(pdf_path, page_indexes, workers, settings=None, spill_dir=None,
+                   page_cache=None, batch_size=None):
+    """ocr_pages as a generator of (index, text, timings), in page order
+
+    Each page is yielded as soon as it and the pages before it are back
+    from the pool; closing the generator early drops the pages not yet
+    started.
+    """
+    page_indexes = list(page_indexes)
+    cache_spec = (page_cache.cache_dir, page_cache.max_bytes) if page_cache else None
+    jobs = [(pdf_path, index, settings, spill_dir, cache_spec) for index in page_indexes]
+    if batch_size is None:
+        batch_size = max(1, len(jobs) // (workers * 4))
+    pool_results = get_pool(workers).map(_ocr_page_job, jobs, chunksize=batch_size)
+    try:
+        for index, (text, hit, timings) in zip(page_indexes, pool_results):
+            if hit is True:
+                page_cache.hits += 1
+            elif hit is False:
+                page_cache.misses += 1
+            yield index, text, timings
+    finally:
+        pool_results.close()
@@ -0,0 +1,210 @@
+"""
+Image preprocessing for PDF to Word Converter
+Picks an OCR resolution per page and cleans up page rasters with vectorized NumPy
+"""
+
+import numpy as np
+from PIL import Image
+
+# Resolution of the quick preview used to estimate text size and screen pages
+PREVIEW_RESOLUTION = 72
+
+# Line height (in pixels) Tesseract reads most reliably; lines are rendered close to this
+TARGET_LINE_PX = 40
+
+# Adaptive resolution stays within these bounds...
+MIN_RESOLUTION = 150
+MAX_RESOLUTION = 400
+
+# ...and never produces a raster larger than this many pixels (large-format pages)
+MAX_PIXELS = 35_000_000
+
+# Preprocessing applied before OCR: "none" keeps the grayscale render as it was
+PREPROCESS_MODES = ("none", "gray", "binary")
+
+# Deskew searches this many degrees either side of upright
+MAX_SKEW_DEGREES = 5.0
+
+# A pixel is ink when it is at least this much darker than the paper
+INK_CONTRAST = 64
+
+# Suggested screening thresholds (the screens are off unless asked for).
+# A preview with less than this share of ink pixels may be a blank page;
+# 0.0005 is about 240 pixels on a letter page at 72 DPI, which a short line
+# of text can stay under, so candidates are confirmed at full resolution
+BLANK_PAGE_INK = 0.0005
+
+# A preview with less than this share of pixels changed (by more than
+# INK_CONTRAST) from the page before it may be a duplicate of that page; a
+# changed amount or date can stay under it, so candidates are confirmed too
+DUPLICATE_PAGE_CHANGE = 0.0005
+
+
+def to_gray_array(img):
+    """8-bit grayscale NumPy array of a PIL image; grayscale arrays are returned as they are"""
+    if isinstance(img, np.ndarray):
+        return img
+    return np.asarray(img.convert("L"))
+
+
+def otsu_threshold(gray):
+    """Global Otsu threshold of an 8-bit grayscale array: pixels below it are ink
+
+    The threshold is the first level above the dark class, so a class of a
+    single grey level (pure black on a bi-level fax or 1-bit scan) is ink too.
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if not total:
+        return 128
+    levels = np.arange(256)
+    weight_bg = np.cumsum(hist)
+    weight_fg = total - weight_bg
+    mean_bg = np.cumsum(hist * levels)
+    mean_total = mean_bg[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mean_total * weight_bg - mean_bg * total) ** 2 / (weight_bg * weight_fg)
+    between = np.nan_to_num(between)
+    return int(np.argmax(between)) + 1
+
+
+def estimate_line_height(gray):
+    """Median height in pixels of the text lines in a grayscale page, or None
+
+    Uses the horizontal projection profile: runs of consecutive rows that
+    contain ink are taken as lines, ignoring runs too tall to be text.
+    """
+    ink = gray < otsu_threshold(gray)
+    rows = ink.mean(axis=1) > 0.002
+    if not rows.any():
+        return None
+    # Start/end indexes of each run of inked rows
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    heights = ends - starts
+    heights = heights[(heights >= 2) & (heights <= gray.shape[0] // 10)]
+    if not heights.size:
+        return None
+    return float(np.median(heights))
+
+
+def choose_resolution(page, default=300, min_resolution=MIN_RESOLUTION,
+                      max_resolution=MAX_RESOLUTION, max_pixels=MAX_PIXELS):
+    """Pick an OCR resolution for a page (a SourcePage) from its size and text size
+
+    A 72 DPI preview gives the line height in points; the resolution is set
+    so lines come out around TARGET_LINE_PX pixels tall, then capped so the
+    raster stays under max_pixels.
+    """
+    resolution = default
+    try:
+        line_pt = estimate_line_height(page.render_gray(PREVIEW_RESOLUTION))
+        if line_pt:
+            resolution = TARGET_LINE_PX * 72 / line_pt
+    except Exception:
+        pass
+
+    resolution = min(max(resolution, min_resolution), max_resolution)
+
+    # Large-format pages: keep width x height under max_pixels
+    area_sq_inches = (float(page.width) / 72) * (float(page.height) / 72)
+    if area_sq_inches > 0:
+        resolution = min(resolution, (max_pixels / area_sq_inches) ** 0.5)
+
+    # Round to a multiple of 25 so similar pages share renders (and page-cache entries)
+    return max(25, int(resolution // 25 * 25))
+
+
+def crop_borders(gray, ink, pad=10):
+    """Crop to the inked area, ignoring scanner edges that are mostly black"""
+    row_frac = ink.mean(axis=1)
+    col_frac = ink.mean(axis=0)
+    rows = np.flatnonzero((row_frac > 0) & (row_frac < 0.5))
+    cols = np.flatnonzero((col_frac > 0) & (col_frac < 0.5))
+    if not rows.size or not cols.size:
+        return gray, ink
+    top, bottom = max(rows[0] - pad, 0), min(rows[-1] + pad + 1, gray.shape[0])
+    left, right = max(cols[0] - pad, 0), min(cols[-1] + pad + 1, gray.shape[1])
+    return gray[top:bottom, left:right], ink[top:bottom, left:right]
+
+
+def estimate_skew(ink, max_degrees=MAX_SKEW_DEGREES, step=0.25, max_points=50_000):
+    """Skew angle in degrees that makes text lines horizontal
+
+    Projects a sample of ink pixels onto rotated y axes and keeps the angle
+    whose row histogram is sharpest (largest sum of squares).
+    """
+    ys, xs = np.nonzero(ink)
+    if ys.size < 100:
+        return 0.0
+    if ys.size > max_points:
+        pick = np.random.default_rng(0).choice(ys.size, max_points, replace=False)
+        ys, xs = ys[pick], xs[pick]
+
+    angles = np.arange(-max_degrees, max_degrees + step / 2, step)
+    radians = np.deg2rad(angles)[:, None]
+    projected = ys[None, :] * np.cos(radians) - xs[None, :] * np.sin(radians)
+    projected = np.round(projected - projected.min(axis=1, keepdims=True)).astype(np.int64)
+
+    scores = [np.square(np.bincount(row)).sum() for row in projected]
+    return float(angles[int(np.argmax(scores))])
+
+
+def preprocess(img, mode="gray", deskew=False):
+    """Prepare a page raster (a grayscale array, as rendered for OCR) for OCR
+
+    "gray" crops blank/black borders, "binary" additionally applies an Otsu
+    threshold. deskew straightens pages scanned at a slight angle. "none"
+    returns the raster unchanged. The result is an 8-bit grayscale array.
+    """
+    if mode == "none":
+        return img
+
+    gray = to_gray_array(img)
+    ink = gray < otsu_threshold(gray)
+    gray, ink = crop_borders(gray, ink)
+
+    if deskew:
+        # Estimate on a reduced copy; the angle doesn't depend on resolution
+        step = max(1, max(ink.shape) // 1000)
+        angle = estimate_skew(ink[::step, ::step])
+        if abs(angle) >= 0.25:
+            # estimate_skew gives the counter-clockwise tilt as a negative angle,
+            # and Image.rotate turns counter-clockwise for positive ones
+            rotated = Image.fromarray(gray).rotate(angle, resample=Image.BILINEAR,
+                                                   expand=True, fillcolor=255)
+            gray = np.asarray(rotated)
+            ink = gray < otsu_threshold(gray)
+
+    if mode == "binary":
+        # White paper, black ink, one byte per pixel
+        return np.where(ink, np.uint8(0), np.uint8(255))
+    return gray
+
+
+def ink_ratio(gray):
+    """Share of a grayscale page's pixels that are ink, ignoring scanner edges
+
+    The paper colour is the most common grey level, so off-white and dark
+    scans are judged alike. Rows and columns that are mostly dark (the black
+    border of a feeder scan) are left out.
+    """
+    paper = int(np.argmax(np.bincount(gray.ravel(), minlength=256)))
+    ink = gray < paper - INK_CONTRAST
+    rows = ink.mean(axis=1) < 0.5
+    cols = ink.mean(axis=0) < 0.5
+    if not rows.any() or not cols.any():
+        return 0.0
+    return float(ink[rows][:, cols].mean())
+
+
+def changed_ratio(gray, other):
+    """Share of pixels that differ by more than INK_CONTRAST between two pages
+
+    Pages rendered at different sizes count as entirely different.
+    """
+    if other is None or gray.shape != other.shape:
+        return 1.0
+    diff = np.abs(gray.astype(np.int16) - other)
+    return float(np.count_nonzero(diff > INK_CONTRAST)) / diff.size
@@ -0,0 +1,137 @@
+"""
+Progress reporting and cancellation for PDF to Word Converter
+Pages done, current stage and ETA for a running conversion, and a token to stop it
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+# What each engine stage is called in progress messages
+STAGE_LABELS = {
+    "open": "Opening PDF",
+    "triage": "Analyzing pages",
+    "extract_text": "Reading text",
+    "ocr": "Running OCR",
+    "layout": "Converting layout",
+    "save": "Writing DOCX",
+}
+
+
+class ConversionCancelled(BaseException):
+    """Raised inside the engine when its CancelToken is cancelled
+
+    A BaseException (like KeyboardInterrupt) so the engine's per-page and
+    fallback error handling doesn't mistake it for a failed page.
+    """
+
+
+class CancelToken:
+    """Thread-safe flag a caller sets to stop a running conversion between pages
+
+    Backed by a threading.Event, or by any object with set()/is_set() such as
+    a multiprocessing.Manager().Event() to cancel from another process.
+    """
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+@dataclass
+class ProgressEvent:
+    """Snapshot passed to progress callbacks"""
+    pages_done: int
+    pages_total: int
+    stage: str
+    # Pages per second in the current stage; None until a page has finished
+    pages_per_second: float = None
+    # Estimated seconds left at that rate; None while unknown
+    eta_seconds: float = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def fraction(self):
+        return self.pages_done / self.pages_total if self.pages_total else 0.0
+
+    @property
+    def label(self):
+        return STAGE_LABELS.get(self.stage, self.stage)
+
+
+class ProgressTracker:
+    """Counts finished pages, reports them to a callback and checks for cancellation
+
+    The rate behind the ETA is measured within the current stage, since a
+    text page and an OCR'd page differ in cost by orders of magnitude.
+    callback is called on the converting thread; GUIs should hand the event
+    over to their own thread.
+    """
+
+    def __init__(self, callback=None, cancel=None):
+        self.callback = callback
+        self.cancel = cancel
+        self.pages_done = 0
+        self.pages_total = 0
+        self.stage_name = None
+        self._started = time.perf_counter()
+        self._stage_started = self._started
+        self._stage_done = 0
+
+    def check(self):
+        """Raise ConversionCancelled if the conversion has been cancelled"""
+        if self.cancel is not None and self.cancel.cancelled:
+            raise ConversionCancelled()
+
+    def start(self, pages_total):
+        """(Re)start counting for a document of pages_total pages"""
+        self.pages_total = pages_total
+        self.pages_done = 0
+        self._stage_done = 0
+        self._stage_started = time.perf_counter()
+        self._report()
+
+    def stage(self, name):
+        """Enter a new stage (see STAGE_LABELS)"""
+        self.check()
+        self.stage_name = name
+        self._stage_started = time.perf_counter()
+        self._stage_done = 0
+        self._report()
+
+    def advance(self, pages=1):
+        """Count finished pages, then stop here if cancelled"""
+        self.pages_done = min(self.pages_done + pages, self.pages_total)
+        self._stage_done += pages
+        self._report()
+        self.check()
+
+    def _report(self):
+        if self.callback is None:
+            return
+        now = time.perf_counter()
+        rate = eta = None
+        stage_elapsed = now - self._stage_started
+        if self._stage_done and stage_elapsed > 0:
+            rate = self._stage_done / stage_elapsed
+            eta = (self.pages_total - self.pages_done) / rate
+        self.callback(ProgressEvent(self.pages_done, self.pages_total, self.stage_name,
+                                    rate, eta, now - self._started))
+
+
+def format_eta(seconds):
+    """Short human form of an ETA: "45 s", "12 min", "1 h 05 min" """
+    if seconds is None:
+        return "estimating..."
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
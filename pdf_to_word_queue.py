@@ -0,0 +1,225 @@
+"""
+Job queue for PDF to Word Converter
+Runs many conversions at once, with separate limits for OCR-heavy and text-only jobs
+"""
+
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+import pdf_to_word_engine as engine
+import pdf_to_word_progress as progress
+import pdf_to_word_triage as triage
+
+# Lifecycle of a job; the last three are final
+JOB_STATES = ("pending", "running", "done", "failed", "cancelled")
+FINAL_STATES = ("done", "failed", "cancelled")
+
+# Scheduling classes: "ocr" jobs run Tesseract on at least one page
+JOB_KINDS = ("ocr", "text")
+
+
+def job_kind(pdf_path, conversion_mode):
+    """"ocr" if converting pdf_path in this mode will OCR some page, else "text" """
+    if conversion_mode == "text":
+        return "text"
+    try:
+        pages = triage.triage_pages(pdf_path)
+    except Exception:
+        return "text"  # unreadable; it will fail quickly either way
+    return "ocr" if any(p.route == "ocr" for p in pages) else "text"
+
+
+@dataclass
+class Job:
+    """One queued conversion and what is known about it so far"""
+    id: int
+    input: str
+    output: str
+    mode: str
+    # "ocr" or "text" once classified
+    kind: str = None
+    state: str = "pending"
+    # Latest ProgressEvent reported by the worker
+    progress: object = None
+    error: str = None
+    seconds: float = None
+    future: object = field(default=None, repr=False)
+    cancel_event: object = field(default=None, repr=False)
+
+    @property
+    def finished(self):
+        return self.state in FINAL_STATES
+
+
+def _init_worker():
+    """Per-process setup: point pytesseract at a working Tesseract"""
+    engine.find_tesseract()
+
+
+def _run_job(job_id, pdf_path, docx_path, conversion_mode, options, events, cancel_event):
+    """Worker entry point: convert one file, sending progress events to the parent"""
+    events.put((job_id, "running", None))
+    started = time.perf_counter()
+    try:
+        success = engine.pdf_to_word_best(
+            pdf_path, docx_path, conversion_mode, options,
+            on_progress=lambda event: events.put((job_id, "progress", event)),
+            cancel=progress.CancelToken(cancel_event))
+        state, error = ("done", None) if success else ("failed", "Conversion failed")
+    except progress.ConversionCancelled:
+        state, error = "cancelled", None
+    except Exception as e:
+        state, error = "failed", str(e)
+    return {"state": state, "error": error, "seconds": time.perf_counter() - started}
+
+
+class JobQueue:
+    """Runs queued conversions on two process pools, one per job kind
+
+    The pool sizes are the concurrency limits: OCR-heavy jobs are CPU and
+    memory hungry for minutes, text-only jobs are short, so each kind gets
+    its own limit and a long OCR backlog doesn't hold up quick text files.
+    Jobs are classified by a quick triage when added. Call poll() regularly
+    (e.g. from the GUI's event loop) to pick up progress from the workers.
+    """
+
+    def __init__(self, ocr_slots=1, text_slots=2, options=None):
+        self.options = options or engine.ConversionOptions()
+        self.slots = {"ocr": max(1, ocr_slots), "text": max(1, text_slots)}
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._manager = None
+        self._events = None
+        # Triage runs off the caller's thread, one file at a time
+        self._classifier = ThreadPoolExecutor(max_workers=1)
+
+    def _pool(self, kind):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.Manager()
+                self._events = self._manager.Queue()
+            pool = self._pools.get(kind)
+            if pool is None:
+                pool = self._pools[kind] = ProcessPoolExecutor(
+                    max_workers=self.slots[kind], initializer=_init_worker)
+            return pool
+
+    def set_limits(self, ocr_slots, text_slots):
+        """Change the concurrency limits
+
+        Jobs already handed to a pool finish there; new jobs go to pools of
+        the new size.
+        """
+        new = {"ocr": max(1, ocr_slots), "text": max(1, text_slots)}
+        with self._lock:
+            for kind, slots in new.items():
+                if slots != self.slots[kind] and kind in self._pools:
+                    self._pools.pop(kind).shutdown(wait=False)
+            self.slots = new
+
+    def add(self, pdf_path, docx_path, conversion_mode="auto"):
+        """Queue a conversion; returns its Job"""
+        job = Job(next(self._ids), pdf_path, docx_path, conversion_mode)
+        self.jobs.append(job)
+        self._classifier.submit(self._submit, job)
+        return job
+
+    def _submit(self, job):
+        pool = None
+        try:
+            job.kind = job_kind(job.input, job.mode)
+            pool = self._pool(job.kind)
+            # Under the lock, so cancel() sees the job either still pending
+            # without a future or with its future set, never in between
+            with self._lock:
+                if job.state != "pending":
+                    return  # cancelled while being classified
+                job.cancel_event = self._manager.Event()
+                job.future = pool.submit(_run_job, job.id, job.input, job.output, job.mode,
+                                         self.options, self._events, job.cancel_event)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died; later jobs of this kind get a fresh pool
+                with self._lock:
+                    if self._pools.get(job.kind) is pool:
+                        del self._pools[job.kind]
+            job.state, job.error = "failed", f"Could not start the conversion: {e}"
+            return
+        job.future.add_done_callback(lambda future, job=job: self._finished(job, future))
+
+    def _finished(self, job, future):
+        if future.cancelled():
+            job.state = "cancelled"
+            return
+        try:
+            result = future.result()
+        except Exception as e:  # worker process died
+            result = {"state": "failed", "error": str(e), "seconds": None}
+        job.state, job.error, job.seconds = result["state"], result["error"], result["seconds"]
+
+    def poll(self):
+        """Apply progress events sent by the workers since the last call"""
+        if self._events is None:
+            return
+        by_id = {job.id: job for job in self.jobs}
+        while True:
+            try:
+                job_id, kind, event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            job = by_id.get(job_id)
+            if job is None or job.finished:
+                continue
+            if kind == "running":
+                job.state = "running"
+            else:
+                job.progress = event
+
+    def cancel(self, job):
+        """Cancel a pending job, or stop a running one at its next page"""
+        with self._lock:
+            if job.finished:
+                return
+            if job.future is None or job.future.cancel():
+                job.state = "cancelled"
+                return
+            cancel_event = job.cancel_event
+        cancel_event.set()
+
+    def cancel_all(self):
+        for job in self.jobs:
+            self.cancel(job)
+
+    def clear_finished(self):
+        """Forget jobs that are done, failed or cancelled"""
+        self.jobs = [job for job in self.jobs if not job.finished]
+
+    def active(self):
+        return any(not job.finished for job in self.jobs)
+
+    def counts(self):
+        """Number of jobs in each state"""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        for job in self.jobs:
+            counts[job.state] += 1
+        return counts
+
+    def shutdown(self):
+        """Cancel everything and stop the worker processes"""
+        self.cancel_all()
+        self._classifier.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._pools.clear()
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
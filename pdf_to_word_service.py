@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Local HTTP conversion service for PDF to Word Converter
+One shared converter for tools that would otherwise each run their own copy
+
+Endpoints (send the PDF itself as the request body):
+  POST   /convert?mode=auto&filename=a.pdf   convert and answer with the DOCX
+  POST   /jobs?mode=auto&filename=a.pdf      queue a job, answer 202 with its id
+  GET    /jobs/<id>                          job state as JSON
+  GET    /jobs/<id>/result                   the DOCX once the job is done
+  DELETE /jobs/<id>                          cancel a job or delete its result
+  GET    /health                             queue and capacity as JSON
+  GET    /metrics                            Prometheus text-format metrics
+
+text=pdfplumber (fidelity) or text=pdfium (throughput) picks the page text
+extraction for one job; without it the --text-backend option applies.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+import pdf_to_word_cli as cli
+import pdf_to_word_engine as engine
+import pdf_to_word_source as pdf_source
+
+DEFAULT_PORT = 8765
+
+# Uploads are streamed to disk in pieces of this size
+CHUNK_SIZE = 64 * 1024
+
+# Backpressure defaults: jobs waiting or converting, and upload bytes held
+# on disk until their conversion finishes
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_MAX_INFLIGHT_MB = 512
+DEFAULT_MAX_UPLOAD_MB = 200
+
+# Finished results are deleted if nobody fetches them within this time
+DEFAULT_RESULT_TTL = 3600
+
+# Largest request line plus headers accepted
+MAX_HEADER_BYTES = 16 * 1024
+
+REASONS = {
+    100: "Continue", 200: "OK", 202: "Accepted", 204: "No Content", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 411: "Length Required",
+    413: "Payload Too Large", 415: "Unsupported Media Type", 422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class HTTPError(Exception):
+    """Answer the request with this status and a JSON error message"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict
+    headers: dict
+    reader: asyncio.StreamReader = field(repr=False)
+    writer: asyncio.StreamWriter = field(repr=False)
+
+    def param(self, name, default=None):
+        return self.query.get(name, [default])[0]
+
+
+@dataclass
+class ServiceJob:
+    """One conversion: its files on disk and where it is in its lifecycle"""
+    id: str
+    mode: str
+    filename: str
+    input: str
+    output: str
+    bytes: int
+    # None = the service's --text-backend
+    text_backend: str = None
+    # queued, running, done, failed or cancelled
+    state: str = "queued"
+    error: str = None
+    pages: int = None
+    seconds: float = None
+    created: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def as_dict(self, position=None):
+        info = {
+            "id": self.id,
+            "state": self.state,
+            "mode": self.mode,
+            "text_backend": self.text_backend,
+            "filename": self.filename,
+            "bytes": self.bytes,
+            "pages": self.pages,
+            "seconds": self.seconds,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "status_url": f"/jobs/{self.id}",
+            "result_url": f"/jobs/{self.id}/result",
+        }
+        if position is not None:
+            info["queue_position"] = position
+        return info
+
+
+async def read_request(reader, writer):
+    """Parse the request line and headers; the body is left on the stream"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+    except asyncio.IncompleteReadError:
+        return None  # client went away
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    url = urllib.parse.urlsplit(target)
+    return Request(method.upper(), url.path.rstrip("/") or "/",
+                   urllib.parse.parse_qs(url.query), headers, reader, writer)
+
+
+async def iter_body(request):
+    """Yield the request body in pieces, for Content-Length and chunked uploads"""
+    reader = request.reader
+    if "chunked" in request.headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";")[0].strip(), 16)
+            except ValueError:
+                raise HTTPError(400, "Malformed chunked upload")
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return
+            remaining = size
+            while remaining:
+                chunk = await reader.read(min(remaining, CHUNK_SIZE))
+                if not chunk:
+                    raise HTTPError(400, "Upload ended early")
+                remaining -= len(chunk)
+                yield chunk
+            await reader.readexactly(2)
+    else:
+        remaining = int(request.headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, CHUNK_SIZE))
+            if not chunk:
+                raise HTTPError(400, "Upload ended early")
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def send(writer, status, body=b"", content_type="application/json", headers=None):
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close"]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def send_json(writer, status, data, headers=None):
+    await send(writer, status, json.dumps(data).encode("utf-8"), headers=headers)
+
+
+async def send_file(writer, path, filename):
+    """Stream a DOCX to the client without reading it into memory"""
+    size = os.path.getsize(path)
+    quoted = urllib.parse.quote(filename)
+    head = ["HTTP/1.1 200 OK",
+            f"Content-Type: {DOCX_TYPE}",
+            f"Content-Length: {size}",
+            f"Content-Disposition: attachment; filename*=UTF-8''{quoted}",
+            "Connection: close"]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+
+
+class ConversionService:
+    """Job queue in front of a process pool, served over HTTP by asyncio
+
+    The event loop only parses requests and moves bytes; every conversion
+    runs in a worker process, so OCR and pdf2docx never block it. Uploads
+    are admitted only while the queue has room and the bytes of uploads
+    not yet converted stay under max_inflight_bytes; otherwise clients get
+    503 with Retry-After and can try again.
+    """
+
+    def __init__(self, args, work_dir):
+        self.args = args
+        self.options = cli.conversion_options(args)
+        self.work_dir = work_dir
+        self.max_queue = args.max_queue
+        self.max_inflight_bytes = args.max_inflight_mb * 1024 * 1024
+        self.max_upload_bytes = args.max_upload_mb * 1024 * 1024
+        self.result_ttl = args.result_ttl
+        self.jobs = {}
+        self.queue = asyncio.Queue()
+        self.inflight_bytes = 0
+        self.uploading = 0  # uploads being received, not yet queued
+        self.pool = None
+        self.registry, self.json_log = cli.start_telemetry(args)
+        self._tasks = []
+
+    # --- lifecycle ---
+
+    def start(self):
+        self._start_pool()
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.args.workers)]
+        self._tasks.append(asyncio.create_task(self._expire()))
+
+    def _start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.args.workers, initializer=cli.init_worker,
+                                        initargs=cli.cache_arguments(self.args))
+
+    def _restart_pool(self, broken):
+        """Replace the broken pool, once however many of its jobs failed"""
+        if self.pool is not broken:
+            return  # another dispatcher already replaced it
+        self.pool.shutdown(wait=False)
+        self._start_pool()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- job queue ---
+
+    def pending(self):
+        """Jobs queued or converting, counting uploads still being received"""
+        return self.uploading + sum(1 for job in self.jobs.values()
+                                    if job.state in ("queued", "running"))
+
+    def position(self, job):
+        """1-based place of a queued job in the queue"""
+        if job.state != "queued":
+            return None
+        queued = sorted((j for j in self.jobs.values() if j.state == "queued"),
+                        key=lambda j: j.created)
+        return queued.index(job) + 1
+
+    def retry_after(self):
+        return {"Retry-After": str(max(1, min(60, self.pending())))}
+
+    def admit(self, length):
+        """Refuse an upload that would overflow the queue or the in-flight byte limit"""
+        if self.pending() >= self.max_queue:
+            raise HTTPError(503, "Queue is full, try again later", self.retry_after())
+        if length is not None:
+            if length > self.max_upload_bytes:
+                raise HTTPError(413, f"Upload is larger than {self.args.max_upload_mb} MB")
+            if self.inflight_bytes + length > self.max_inflight_bytes:
+                raise HTTPError(503, "Too much data waiting to be converted, try again later",
+                                self.retry_after())
+
+    async def receive(self, request):
+        """Stream the uploaded PDF to disk and queue it; returns the ServiceJob"""
+        mode = request.param("mode", "auto")
+        if mode not in engine.CONVERSION_MODES:
+            raise HTTPError(400, f"mode must be one of {', '.join(engine.CONVERSION_MODES)}")
+        text_backend = request.param("text")
+        if text_backend is not None and text_backend not in pdf_source.TEXT_BACKENDS:
+            raise HTTPError(400, f"text must be one of {', '.join(pdf_source.TEXT_BACKENDS)}")
+        chunked = "chunked" in request.headers.get("transfer-encoding", "").lower()
+        if not chunked and "content-length" not in request.headers:
+            raise HTTPError(411, "Send the PDF with Content-Length or chunked encoding")
+        try:
+            length = None if chunked else int(request.headers["content-length"])
+        except ValueError:
+            raise HTTPError(400, "Malformed Content-Length")
+        self.admit(length)
+
+        # Checks passed: now let a client that asked first send the body
+        if request.headers.get("expect", "").lower() == "100-continue":
+            request.writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await request.writer.drain()
+
+        job_id = uuid.uuid4().hex
+        filename = os.path.basename(request.param("filename") or "document.pdf")
+        input_path = os.path.join(self.work_dir, f"{job_id}.pdf")
+        # Hold the announced size from the start, so concurrent uploads can't
+        # overshoot the limit together; chunked uploads are counted as they arrive
+        reserved = length or 0
+        self.inflight_bytes += reserved
+        self.uploading += 1
+        received = 0
+        try:
+            with open(input_path, "wb") as f:
+                async for chunk in iter_body(request):
+                    if not received and not chunk.startswith(b"%PDF"):
+                        raise HTTPError(415, "The request body is not a PDF")
+                    received += len(chunk)
+                    if chunked:
+                        reserved += len(chunk)
+                        self.inflight_bytes += len(chunk)
+                        if received > self.max_upload_bytes:
+                            raise HTTPError(413, f"Upload is larger than {self.args.max_upload_mb} MB")
+                        if self.inflight_bytes > self.max_inflight_bytes:
+                            raise HTTPError(503, "Too much data waiting to be converted, "
+                                                 "try again later", self.retry_after())
+                    f.write(chunk)
+            if not received:
+                raise HTTPError(400, "Empty upload")
+        except BaseException:
+            self.inflight_bytes -= reserved
+            self._remove(input_path)
+            raise
+        finally:
+            self.uploading -= 1
+
+        job = ServiceJob(job_id, mode, filename, input_path,
+                         os.path.join(self.work_dir, f"{job_id}.docx"), received, text_backend)
+        self.jobs[job_id] = job
+        self.queue.put_nowait(job)
+        return job
+
+    async def _dispatch(self):
+        """Feed queued jobs to the process pool, one at a time per worker"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job.state != "queued":
+                continue  # cancelled while waiting
+            job.state = "running"
+            job.started = time.time()
+            options = self.options
+            if job.text_backend:
+                options = dataclasses.replace(options, text_backend=job.text_backend)
+            pool = self.pool
+            try:
+                result = await loop.run_in_executor(pool, cli.convert_job, job.input,
+                                                    job.output, job.mode, options)
+            except BrokenProcessPool as e:
+                # A worker died (crash or out of memory); the pool is unusable now
+                result = {"success": False, "error": f"worker process died: {e}"}
+                self._restart_pool(pool)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            finally:
+                self.inflight_bytes -= job.bytes
+                self._remove(job.input)
+
+            if "metrics" in result:
+                cli.record_result(self.args, self.registry, self.json_log, result)
+            job.finished = time.time()
+            if job.state == "cancelled":
+                self._remove(job.output)
+            else:
+                job.state = "done" if result["success"] else "failed"
+                job.error = result.get("error") or (None if result["success"] else "Conversion failed")
+                job.pages = result.get("pages")
+                job.seconds = result.get("seconds")
+                print(f"{'✅' if result['success'] else '❌'} {job.id} {job.filename} "
+                      f"({job.pages or 0} pages, {job.seconds or 0:.2f} s)")
+            job.done.set()
+
+    def cancel(self, job):
+        """Stop a queued job, or drop a job's result; a running job's result is discarded"""
+        if job.state in ("queued", "running"):
+            if job.state == "queued":
+                self.inflight_bytes -= job.bytes
+                self._remove(job.input)
+                job.finished = time.time()
+                job.done.set()
+            job.state = "cancelled"
+        else:
+            self._remove(job.output)
+            del self.jobs[job.id]
+
+    async def _expire(self):
+        """Delete results nobody fetched within result_ttl"""
+        while True:
+            await asyncio.sleep(min(60, self.result_ttl))
+            cutoff = time.time() - self.result_ttl
+            for job in list(self.jobs.values()):
+                if job.finished and job.finished < cutoff:
+                    self._remove(job.output)
+                    del self.jobs[job.id]
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # --- HTTP ---
+
+    def health(self):
+        states = {}
+        for job in self.jobs.values():
+            states[job.state] = states.get(job.state, 0) + 1
+        return {
+            "status": "ok",
+            "workers": self.args.workers,
+            "jobs": states,
+            "pending": self.pending(),
+            "max_queue": self.max_queue,
+            "inflight_bytes": self.inflight_bytes,
+            "max_inflight_bytes": self.max_inflight_bytes,
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            request = await read_request(reader, writer)
+            if request is not None:
+                await self.route(request)
+        except HTTPError as e:
+            try:
+                await send_json(writer, e.status, {"error": str(e)}, e.headers)
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass  # client went away
+        except Exception as e:
+            print(f"❌ Request failed: {e}")
+            try:
+                await send_json(writer, 500, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def route(self, request):
+        parts = [p for p in request.path.split("/") if p]
+        method = request.method
+
+        if parts == ["health"] and method == "GET":
+            await send_json(request.writer, 200, self.health())
+        elif parts == ["metrics"] and method == "GET":
+            await send(request.writer, 200, self.registry.render().encode("utf-8"),
+                       "text/plain; version=0.0.4; charset=utf-8")
+        elif parts == ["convert"] and method == "POST":
+            await self.convert_now(request)
+        elif parts == ["jobs"] and method == "POST":
+            job = await self.receive(request)
+            await send_json(request.writer, 202, job.as_dict(self.position(job)),
+                            {"Location": f"/jobs/{job.id}"})
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, "No such job")
+            if len(parts) == 2 and method == "GET":
+                await send_json(request.writer, 200, job.as_dict(self.position(job)))
+            elif len(parts) == 2 and method == "DELETE":
+                self.cancel(job)
+                await send(request.writer, 204)
+            elif parts[2:] == ["result"] and method == "GET":
+                if job.state != "done":
+                    await send_json(request.writer, 409, job.as_dict(self.position(job)))
+                else:
+                    await send_file(request.writer, job.output, self.result_name(job))
+            else:
+                raise HTTPError(405, "Method not allowed")
+        elif parts in (["health"], ["metrics"], ["convert"], ["jobs"]):
+            raise HTTPError(405, "Method not allowed")
+        else:
+            raise HTTPError(404, "Not found")
+
+    async def convert_now(self, request):
+        """Synchronous flow: the response is the DOCX (or the error) of this upload"""
+        job = await self.receive(request)
+        try:
+            await job.done.wait()
+            if job.state == "done":
+                await send_file(request.writer, job.output, self.result_name(job))
+            elif job.state == "cancelled":
+                raise HTTPError(409, "Job was cancelled")
+            else:
+                raise HTTPError(422, job.error or "Conversion failed")
+        finally:
+            # Nobody can ask for this job again: drop its result, or stop it
+            # if the request ended before it finished
+            if job.finished:
+                self._remove(job.output)
+                self.jobs.pop(job.id, None)
+            else:
+                self.cancel(job)
+
+    @staticmethod
+    def result_name(job):
+        return os.path.splitext(job.filename)[0] + ".docx"
+
+
+async def serve(args):
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="pdf_to_word_service_")
+    os.makedirs(work_dir, exist_ok=True)
+    service = ConversionService(args, work_dir)
+    service.start()
+    server = await asyncio.start_server(service.handle, args.host, args.port,
+                                        limit=MAX_HEADER_BYTES)
+    port = server.sockets[0].getsockname()[1]
+    print(f"🚀 Serving on http://{args.host}:{port} with {args.workers} worker(s)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        print("⏹️ Shutting down")
+        await service.close()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Serve PDF to DOCX conversion over HTTP on this machine.")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: %(default)s, this machine only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="port to listen on, 0 picks a free one (default: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="jobs waiting or converting before uploads get 503 (default: %(default)s)")
+    parser.add_argument("--max-inflight-mb", type=int, default=DEFAULT_MAX_INFLIGHT_MB,
+                        help="upload megabytes held for unfinished jobs before uploads get 503 "
+                             "(default: %(default)s)")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB,
+                        help="largest PDF accepted (default: %(default)s)")
+    parser.add_argument("--result-ttl", type=int, default=DEFAULT_RESULT_TTL,
+                        help="seconds a finished job's result is kept (default: %(default)s)")
+    parser.add_argument("--work-dir",
+                        help="where uploads and results are kept (default: a temporary directory)")
+    cli.add_conversion_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    error = cli.check_conversion_arguments(args)
+    if error:
+        print(f"❌ {error}")
+        return 2
+    if min(args.max_queue, args.max_inflight_mb, args.max_upload_mb, args.result_ttl) < 1:
+        print("❌ --max-queue, --max-inflight-mb, --max-upload-mb and --result-ttl must be at least 1")
+        return 2
+    if not engine.find_tesseract():
+        print("⚠️ Tesseract not found: scanned pages will fail to convert")
+
+    try:
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
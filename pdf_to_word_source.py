@@ -0,0 +1,544 @@
+"""
+Input stage for PDF to Word Converter
+Opens a PDF once per conversion and hands its pages to triage, pdf2docx, text extraction and OCR
+"""
+
+import gc
+import hashlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+import fitz  # PyMuPDF, installed with pdf2docx
+import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from pdf2docx import Converter
+from pdf2docx.page.Pages import Pages
+
+# Where page text comes from on the plain-text path: "pdfplumber" (pure-Python
+# layout analysis, the best reading order and spacing) or "pdfium" (PDFium's
+# native text layer, many times faster)
+TEXT_BACKENDS = ("pdfplumber", "pdfium")
+
+# PDFium marks hyphens it found at line ends with these; drop other control
+# characters, which DOCX can't hold
+_PDFIUM_TEXT_FIXES = {0x02: "-", 0xFFFE: "-", **{c: None for c in range(0x20) if c not in (9, 10)}}
+
+# Images on text pages smaller than this (points, either side) are left
+# alone by region OCR: rules, bullets and icons, not text
+MIN_IMAGE_REGION = 18
+
+# An image with at least this many text-layer characters per square inch
+# over it is already text (a scan behind its own OCR layer) and isn't OCR'd
+COVERED_TEXT_DENSITY = 10
+
+# Left out of page fingerprints: links back into the page tree, and numbers
+# that shift when pages are inserted elsewhere in the document
+_VOLATILE_KEYS = re.compile(r"/(?:Parent|P|StructParents?|LastModified)\b"
+                            r"\s*(?:\d+\s+\d+\s+R|\d+|\([^)]*\))")
+_REFERENCE = re.compile(r"(\d+)\s+\d+\s+R\b")
+_PAGE_TYPE = re.compile(r"/Type\s*/Page\b")
+
+
+class MemoryLimitExceeded(RuntimeError):
+    """The conversion's memory use stayed above its configured ceiling"""
+
+
+def rss_bytes():
+    """Resident set size of this process in bytes, or 0 if it can't be measured
+
+    On macOS only the peak is available, so the limit check there is stricter.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return 0
+    if sys.platform == "win32":
+        return _windows_rss_bytes()
+    try:
+        import resource
+        # ru_maxrss is in bytes on macOS (kilobytes elsewhere)
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except (ImportError, OSError):
+        return 0
+
+
+def _windows_rss_bytes():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                "PagefileUsage", "PeakPagefileUsage")]
+
+    try:
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32, psapi = ctypes.windll.kernel32, ctypes.windll.psapi
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters),
+                                               wintypes.DWORD]
+        if psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters),
+                                      counters.cb):
+            return counters.WorkingSetSize
+    except Exception:
+        pass
+    return 0
+
+
+def _object_digest(doc, xref, memo, top=False):
+    """SHA-256 of a PDF object and everything it references, whatever the xref numbers
+
+    References are replaced by the digest of their target, streams are
+    hashed as stored. Other pages (link targets) count as a fixed token, so
+    one page's fingerprint doesn't depend on the rest of the document.
+    """
+    digest = memo.get(xref)
+    if digest is not None:
+        return digest
+    source = doc.xref_object(xref, compressed=True)
+    if not top and _PAGE_TYPE.search(source):
+        return "page"
+    memo[xref] = "loop"  # a reference back into an object still being hashed
+    source = _VOLATILE_KEYS.sub("", source)
+    source = _REFERENCE.sub(lambda m: _object_digest(doc, int(m.group(1)), memo), source)
+    h = hashlib.sha256(source.encode("utf-8", "replace"))
+    if doc.xref_is_stream(xref):
+        h.update(doc.xref_stream_raw(xref) or b"")
+    digest = memo[xref] = h.hexdigest()
+    return digest
+
+
+class _SharedConverter(Converter):
+    """pdf2docx Converter over a document that is already open
+
+    close() only drops the parsed layouts; the document belongs to the PDFSource.
+    """
+
+    def __init__(self, fitz_doc, pdf_path):
+        self.filename_pdf = pdf_path
+        self.password = ""
+        self._fitz_doc = fitz_doc
+        self._pages = Pages()
+
+    def close(self):
+        self._pages = Pages()
+
+
+def image_blocks(boxes, text_in, width, height):
+    """A text page cut into ("text", text) and ("image", box) blocks, top to bottom
+
+    boxes are the page's image boxes as (x0, top, x1, bottom) in points from
+    the top left; text_in(box) returns the text layer inside such a box.
+    Images too small to hold text or already covered by text are dropped.
+    The page is then cut into horizontal bands at the remaining images
+    (images whose heights overlap share a band): the text of each band
+    comes first, then its images from left to right.
+    """
+    regions = set()
+    for x0, top, x1, bottom in boxes:
+        box = (max(x0, 0), max(top, 0), min(x1, width), min(bottom, height))
+        w, h = box[2] - box[0], box[3] - box[1]
+        if min(w, h) < MIN_IMAGE_REGION:
+            continue
+        covered = len("".join((text_in(box) or "").split()))
+        if covered >= COVERED_TEXT_DENSITY * w * h / 72 ** 2:
+            continue
+        regions.add(box)
+
+    bands = []
+    for box in sorted(regions, key=lambda b: (b[1], b[0])):
+        if bands and box[1] < bands[-1][1]:
+            bands[-1][1] = max(bands[-1][1], box[3])
+            bands[-1][2].append(box)
+        else:
+            bands.append([box[1], box[3], [box]])
+
+    blocks = []
+    y = 0
+    for top, bottom, band_boxes in bands:
+        for text in (text_in((0, y, width, top)), text_in((0, top, width, bottom))):
+            if text:
+                blocks.append(("text", text))
+        blocks.extend(("image", box) for box in sorted(band_boxes))
+        y = bottom
+    text = text_in((0, y, width, height))
+    if text:
+        blocks.append(("text", text))
+    return blocks
+
+
+class PdfplumberText:
+    """Text from pdfplumber's layout analysis (the default: best fidelity)"""
+    name = "pdfplumber"
+
+    def __init__(self, source):
+        self.pdf = pdfplumber.open(source.path if source.data is None else io.BytesIO(source.data))
+
+    def page_text(self, index):
+        page = self.pdf.pages[index]
+        try:
+            return page.extract_text()
+        finally:
+            # Drop the page's parsed objects right away
+            page.close()
+
+    def page_blocks(self, index):
+        """image_blocks() of a page from pdfplumber's image objects, [] without text"""
+        page = self.pdf.pages[index]
+        try:
+            text = page.extract_text()
+            if not text or not page.images:
+                return [("text", text)] if text else []
+
+            def text_in(box):
+                # Each character goes to the box holding its centre, so
+                # neighbouring bands never share or lose one
+                x0, top, x1, bottom = box
+                return page.filter(lambda obj: obj.get("object_type") == "char"
+                                   and x0 <= (obj["x0"] + obj["x1"]) / 2 < x1
+                                   and top <= (obj["top"] + obj["bottom"]) / 2 < bottom
+                                   ).extract_text()
+
+            boxes = [(img["x0"], img["top"], img["x1"], img["bottom"]) for img in page.images]
+            return image_blocks(boxes, text_in, page.width, page.height)
+        finally:
+            page.close()
+
+    def release(self):
+        self.pdf.flush_cache()
+
+    def close(self):
+        self.pdf.close()
+
+
+class PdfiumText:
+    """Text straight from PDFium's text layer (best throughput)
+
+    Reads the source's PDFium document, the one OCR renders come from. Lines
+    follow the content stream, so columns and tables can come out in a
+    different order or with different spacing than pdfplumber's.
+    """
+    name = "pdfium"
+
+    def __init__(self, source):
+        self.source = source
+
+    def page_text(self, index):
+        page = self.source.pdfium_doc[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_bounded()
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+        return self._clean(text)
+
+    @staticmethod
+    def _clean(text):
+        text = text.replace("\r\n", "\n").translate(_PDFIUM_TEXT_FIXES)
+        # Like pdfplumber: no text at all is "", so the page goes to OCR
+        return text if text.strip() else ""
+
+    def page_blocks(self, index):
+        """image_blocks() of a page from PDFium's image objects, [] without text"""
+        page = self.source.pdfium_doc[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text = self._clean(textpage.get_text_bounded())
+                width, height = page.get_size()
+                boxes = []
+                for image in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+                    left, bottom, right, top = image.get_bounds()
+                    boxes.append((left, height - top, right, height - bottom))
+                if not text or not boxes:
+                    return [("text", text)] if text else []
+
+                # Character centres from the top left; spaces (flat boxes on
+                # the baseline) and inserted line breaks go with the character before
+                centres = []
+                for i in range(textpage.count_chars()):
+                    left, bottom, right, top = textpage.get_charbox(i)
+                    centres.append(((left + right) / 2, height - (bottom + top) / 2)
+                                   if right > left and top - bottom >= 1 else None)
+
+                def text_in(box):
+                    # Like pdfplumber's: each character goes to the box
+                    # holding its centre, in runs of consecutive characters
+                    x0, top, x1, bottom = box
+                    runs, start, inside = [], None, False
+                    for i, centre in enumerate(centres + [(-1, -1)]):
+                        if centre is not None:
+                            inside = x0 <= centre[0] < x1 and top <= centre[1] < bottom
+                        if inside and start is None:
+                            start = i
+                        elif not inside and start is not None:
+                            runs.append(textpage.get_text_range(start, i - start))
+                            start = None
+                    return self._clean("\n".join(runs))
+
+                return image_blocks(boxes, text_in, width, height)
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass  # the document belongs to the source
+
+
+_TEXT_BACKEND_CLASSES = {"pdfplumber": PdfplumberText, "pdfium": PdfiumText}
+
+
+class SourcePage:
+    """One page of a PDFSource, or a box on it: its size, text and renders"""
+
+    def __init__(self, source, index, box=None):
+        self.source = source
+        self.index = index
+        self.page_number = index + 1
+        self.box = box
+        if box is None:
+            self.width, self.height = source.page_size(index)
+        else:
+            self.width, self.height = box[2] - box[0], box[3] - box[1]
+
+    def region(self, box):
+        """The part of this page inside box, (x0, top, x1, bottom) in points"""
+        return SourcePage(self.source, self.index, box)
+
+    def render_gray(self, resolution):
+        return self.source.render_gray(self.index, resolution, self.box)
+
+    def extract_text(self):
+        return self.source.extract_text(self.index)
+
+
+class PDFSource:
+    """A PDF opened once for the whole conversion
+
+    Every stage reads pages through this object instead of opening the file
+    itself: triage and pdf2docx share one PyMuPDF document, OCR renders come
+    from PDFium and page text from the text_backend (see TEXT_BACKENDS):
+    one pdfplumber parse, or the same PDFium document the renders use. Each
+    is opened on first use, so auto mode, which learns from triage which
+    pages have no text, never pays for text extraction at all.
+
+    Pages are let go as soon as they are finished (page_done), so memory no
+    longer grows with the page count. With memory_limit_mb, the process's
+    RSS is checked at every page boundary; above the limit, cached page data
+    is released, and if that doesn't get it back under the limit the
+    conversion stops with MemoryLimitExceeded.
+
+    The PDF may be given as bytes instead of a path; then it is only written
+    to disk if a stage that runs in other processes needs a file (see path).
+    """
+
+    def __init__(self, pdf, memory_limit_mb=None, text_backend="pdfplumber"):
+        if text_backend not in _TEXT_BACKEND_CLASSES:
+            raise ValueError(f"text_backend must be one of {', '.join(TEXT_BACKENDS)}")
+        # pdf is a path, or the PDF's bytes (read straight from memory)
+        if isinstance(pdf, (bytes, bytearray, memoryview)):
+            self.data = bytes(pdf)
+            self.name = "document.pdf"
+            self._path = None
+        else:
+            self.data = None
+            self.name = self._path = pdf
+        self._temp_dir = None
+        self.text_backend = text_backend
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.peak_rss = 0
+        self._fitz = None
+        self._text = None
+        self._pdfium = None
+        self._rendered = False
+        self._digests = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def path(self):
+        """Path of a file holding the PDF, for worker processes that open it themselves
+
+        A PDF given as bytes is written to a private temporary directory the
+        first time this is asked for (and removed by close()); in this
+        process every stage reads the bytes directly.
+        """
+        if self._path is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="pdf_to_word_")
+            path = os.path.join(self._temp_dir, self.name)
+            with open(path, "wb") as f:
+                f.write(self.data)
+            self._path = path
+        return self._path
+
+    @property
+    def fitz_doc(self):
+        """The PyMuPDF document (triage, pdf2docx and page sizes)"""
+        if self._fitz is None:
+            if self.data is None:
+                self._fitz = fitz.open(self.path)
+            else:
+                self._fitz = fitz.open(stream=self.data, filetype="pdf")
+        return self._fitz
+
+    def converter(self):
+        """A pdf2docx Converter sharing this source's PyMuPDF document"""
+        return _SharedConverter(self.fitz_doc, self.name)
+
+    @property
+    def pdfium_doc(self):
+        """The PDFium document (OCR renders)"""
+        if self._pdfium is None:
+            self._pdfium = pdfium.PdfDocument(self.path if self.data is None else self.data)
+        return self._pdfium
+
+    @property
+    def text_extractor(self):
+        """The text backend (a PdfplumberText or PdfiumText)"""
+        if self._text is None:
+            self._text = _TEXT_BACKEND_CLASSES[self.text_backend](self)
+        return self._text
+
+    @property
+    def page_count(self):
+        if self._fitz is not None:
+            return len(self._fitz)
+        return len(self.pdfium_doc)
+
+    def page_size(self, index):
+        """(width, height) of a page in points, from whichever document is open"""
+        if self._fitz is not None:
+            rect = self._fitz[index].rect
+            return rect.width, rect.height
+        return self.pdfium_doc.get_page_size(index)
+
+    def page(self, index):
+        return SourcePage(self, index)
+
+    def page_fingerprint(self, index):
+        """SHA-256 of everything that decides how a page looks
+
+        Covers the page's geometry, content streams, resources (fonts,
+        images, forms) and annotations, but not where it sits in the
+        document: the same page in a revised PDF, even with pages inserted
+        before it, keeps its fingerprint. Objects shared between pages are
+        hashed once per source.
+        """
+        doc = self.fitz_doc
+        page = doc[index]
+        h = hashlib.sha256(f"{tuple(page.mediabox)}|{tuple(page.cropbox)}|{page.rotation}".encode())
+        h.update(_object_digest(doc, page.xref, self._digests, top=True).encode())
+        # Resources can also be inherited from the page tree
+        xref = page.xref
+        while doc.xref_get_key(xref, "Resources")[0] == "null":
+            kind, parent = doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                break
+            xref = int(parent.split()[0])
+            kind, value = doc.xref_get_key(xref, "Resources")
+            if kind != "null":
+                value = _REFERENCE.sub(lambda m: _object_digest(doc, int(m.group(1)), self._digests),
+                                       value)
+                h.update(value.encode("utf-8", "replace"))
+        return h.hexdigest()
+
+    def extract_text(self, index):
+        """Text of a page from the text backend, "" if it has none"""
+        return self.text_extractor.page_text(index)
+
+    def page_blocks(self, index):
+        """A text page's text and image regions in reading order (see image_blocks)
+
+        [] when the page has no text layer; those pages are OCR'd whole.
+        """
+        return self.text_extractor.page_blocks(index)
+
+    def render_gray(self, index, resolution, box=None):
+        """8-bit grayscale NumPy array (height x width) of a page, or of box on it
+
+        PDFium renders straight into a one-byte-per-pixel buffer and the
+        array is a view of that buffer, not a copy: no colour raster and no
+        PIL image in between. The pixels equal pdfplumber's to_image render
+        converted to "L". The page is closed as soon as it is drawn; the
+        buffer lives as long as the array. box is (x0, top, x1, bottom) in
+        points; only that part of the page is rasterized.
+        """
+        self._rendered = True
+        page = self.pdfium_doc[index]
+        try:
+            crop = (0, 0, 0, 0)
+            if box is not None:
+                width, height = page.get_size()
+                crop = (box[0], height - box[3], width - box[2], box[1])
+            bitmap = page.render(scale=resolution / 72, crop=crop, grayscale=True,
+                                 no_smoothtext=True, no_smoothpath=True, no_smoothimage=True)
+        finally:
+            page.close()
+        return bitmap.to_numpy()
+
+    def page_done(self):
+        """Call after each finished page: releases its render state, enforces the memory limit"""
+        # PDFium holds on to every object it has loaded (a scan's image
+        # stream, say) until its document is closed. Reopening costs about a
+        # millisecond, so a fresh one after each render keeps long scans flat;
+        # text-only pages keep it, they share fonts with the next page.
+        if self._rendered:
+            self._close_pdfium()
+        rss = rss_bytes()
+        self.peak_rss = max(self.peak_rss, rss)
+        if self.memory_limit is None or rss <= self.memory_limit:
+            return
+        self.release()
+        rss = rss_bytes()
+        if rss > self.memory_limit:
+            raise MemoryLimitExceeded(
+                f"memory use {rss / 2**20:.0f} MB is over the "
+                f"{self.memory_limit / 2**20:.0f} MB limit")
+
+    def release(self):
+        """Free everything cached for pages already finished"""
+        if self._text is not None:
+            self._text.release()
+        self._close_pdfium()
+        fitz.TOOLS.store_shrink(100)
+        gc.collect()
+
+    def _close_pdfium(self):
+        if self._pdfium is not None:
+            self._pdfium.close()
+            self._pdfium = None
+        self._rendered = False
+
+    def close(self):
+        for doc in (self._text, self._pdfium, self._fitz):
+            if doc is not None:
+                try:
+                    doc.close()
+                except Exception:
+                    pass
+        self._fitz = self._text = self._pdfium = None
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = self._path = None
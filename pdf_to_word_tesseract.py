@@ -0,0 +1,112 @@
+"""
+Tesseract discovery for PDF to Word Converter
+Finds a working Tesseract without loading the OCR libraries, and remembers it across launches
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Places to look for the Tesseract executable, in order
+TESSERACT_PATHS = [
+    r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+    r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+    "tesseract"
+]
+
+# Bump when the cache file's layout changes
+CACHE_FORMAT = 1
+
+# Seconds to wait for "tesseract --version"
+PROBE_TIMEOUT = 15
+
+
+def cache_path():
+    """Per-user file the discovered Tesseract is remembered in"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PDF to Word Converter", "tesseract.json")
+    if sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "pdf-to-word-converter", "tesseract.json")
+
+
+def executable_signature(path):
+    """What identifies an installed executable: real path, size and modification time"""
+    st = os.stat(path)
+    return [os.path.realpath(path), st.st_size, st.st_mtime_ns]
+
+
+def probe(path):
+    """Version of the Tesseract at path, or None if it doesn't run"""
+    kwargs = {}
+    if sys.platform == "win32":
+        # No console window flashing up from the windowed build
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True,
+                                errors="replace", timeout=PROBE_TIMEOUT, **kwargs)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Older versions print the banner to stderr
+    match = re.search(r"tesseract\s+v?(\S+)", result.stdout + result.stderr, re.IGNORECASE)
+    return match.group(1) if result.returncode == 0 and match else None
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry if entry.get("format") == CACHE_FORMAT else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _save(path, entry):
+    """Write the cache atomically; a read-only profile just means no caching"""
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def discover(use_cache=True):
+    """(path, version) of a working Tesseract, or (None, None) if there is none
+
+    Starting Tesseract to check it takes a noticeable moment per candidate,
+    so the result is remembered together with the executable's signature.
+    Later calls (in later launches too) trust the remembered path without
+    starting it, until the executable is replaced, upgraded or removed.
+    A failed search isn't cached, so installing Tesseract is noticed at once.
+    """
+    cache_file = cache_path()
+    if use_cache:
+        entry = _load(cache_file)
+        try:
+            if entry and executable_signature(entry["path"]) == entry["signature"]:
+                return entry["path"], entry["tesseract_version"]
+        except (OSError, KeyError, TypeError):
+            pass  # gone or unreadable: search again
+
+    for candidate in TESSERACT_PATHS:
+        path = shutil.which(candidate)
+        if not path:
+            continue
+        path = os.path.abspath(path)
+        version = probe(path)
+        if version:
+            _save(cache_file, {"format": CACHE_FORMAT, "path": path, "tesseract_version": version,
+                               "signature": executable_signature(path)})
+            return path, version
+    return None, None
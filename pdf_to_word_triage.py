@@ -0,0 +1,64 @@
+"""
+Page triage for PDF to Word Converter
+Classifies each page as text, scanned or mixed so Auto mode can route it
+"""
+
+from dataclasses import dataclass
+
+import fitz  # PyMuPDF, installed with pdf2docx
+
+# A page needs at least this many non-whitespace characters to count as having a text layer
+MIN_TEXT_CHARS = 1
+
+# Text pages whose images cover at least this fraction of the page are "mixed"
+MIXED_IMAGE_COVERAGE = 0.3
+
+
+@dataclass
+class PageTriage:
+    """Why a page was sent down a given conversion route"""
+    index: int
+    kind: str             # "text", "scanned" or "mixed"
+    route: str            # "layout" (pdf2docx) or "ocr"
+    text_chars: int
+    image_coverage: float
+    reason: str
+
+
+def classify_page(page):
+    """Classify one PyMuPDF page from its text layer and image coverage"""
+    text_chars = sum(1 for ch in page.get_text("text") if not ch.isspace())
+
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height or 1.0
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"]) & page_rect
+        if not bbox.is_empty:
+            covered += bbox.width * bbox.height
+    # Overlapping images can sum past the page area
+    coverage = min(covered / page_area, 1.0)
+
+    if text_chars < MIN_TEXT_CHARS:
+        kind, route = "scanned", "ocr"
+        reason = f"no text layer, images cover {coverage:.0%} of the page"
+    elif coverage >= MIXED_IMAGE_COVERAGE:
+        kind, route = "mixed", "layout"
+        reason = f"{text_chars} text chars, images cover {coverage:.0%} of the page"
+    else:
+        kind, route = "text", "layout"
+        reason = f"{text_chars} text chars"
+
+    return PageTriage(page.number, kind, route, text_chars, coverage, reason)
+
+
+def triage_pages(pdf):
+    """Classify every page of a PDF
+
+    pdf is a file path or an already open PyMuPDF document (such as a
+    pdf2docx Converter's fitz_doc), which is left open.
+    """
+    if isinstance(pdf, fitz.Document):
+        return [classify_page(page) for page in pdf]
+    with fitz.open(pdf) as doc:
+        return [classify_page(page) for page in doc]
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Hot-folder daemon for PDF to Word Converter
+Watches an inbox directory and converts every PDF dropped into it, unattended
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pdf_to_word_cli as cli
+import pdf_to_word_docx as docx_writer
+import pdf_to_word_engine as engine
+
+# A file counts as completely written once its size and modification time
+# have stayed the same for this long
+SETTLE_SECONDS = 2.0
+
+# How often the inbox is listed when OS file notifications aren't available
+POLL_SECONDS = 2.0
+
+# With notifications, still rescan this often in case an event was missed
+RESCAN_SECONDS = 60.0
+
+# Conversions write here first and are renamed into place when complete, so
+# the outbox never holds a half-written DOCX
+PART_SUFFIX = ".part.docx"
+
+
+def log(message):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+def is_candidate(name):
+    """PDFs only; skips hidden files and Office/editor lock and temp files"""
+    return name.lower().endswith(".pdf") and not name.startswith((".", "~$"))
+
+
+def unique_path(directory, name):
+    """directory/name, or name_1, name_2, ... if that is taken"""
+    base, ext = os.path.splitext(name)
+    path = os.path.join(directory, name)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{base}_{counter}{ext}")
+        counter += 1
+    return path
+
+
+def start_observer(directory, wake):
+    """Set wake on every change in directory using the OS notification API
+
+    Uses watchdog (inotify, FSEvents, ReadDirectoryChangesW) when installed;
+    returns None if it isn't, and the caller falls back to polling.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    observer.schedule(Handler(), directory, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+class HotFolder:
+    """Converts PDFs arriving in inbox to DOCX files in outbox
+
+    Inputs move to processed_dir after a successful conversion, or to
+    failed_dir with a .error.txt note beside them. At most `workers` files
+    are converting at once; the rest wait in the inbox, so whatever is
+    still there when the daemon stops is simply picked up at the next start.
+    """
+
+    def __init__(self, inbox, outbox, processed_dir, failed_dir, args,
+                 settle_seconds=SETTLE_SECONDS, poll_seconds=POLL_SECONDS):
+        self.inbox = os.path.abspath(inbox)
+        self.outbox = os.path.abspath(outbox)
+        self.processed_dir = os.path.abspath(processed_dir)
+        self.failed_dir = os.path.abspath(failed_dir)
+        self.args = args
+        self.options = cli.conversion_options(args)
+        self.settle_seconds = settle_seconds
+        self.poll_seconds = poll_seconds
+        self.wake = threading.Event()
+        self.stopping = False
+        self.pool = None
+        self.in_flight = {}  # input path -> (future, part path, pool)
+        self._seen = {}      # input path -> ((size, mtime), when first seen so)
+        self.converted = 0
+        self.failed = 0
+        self.registry, self.json_log = cli.start_telemetry(args)
+
+    # --- startup ---
+
+    def reconcile(self):
+        """Clean up after an earlier run that stopped part-way
+
+        Partial outputs of conversions that never finished are removed, with
+        the streaming DOCX writer's temp files next to them; their inputs are
+        still in the inbox and are converted again. PDFs that arrived while
+        the daemon was down are found by the first scan.
+        """
+        for directory in (self.outbox, self.processed_dir, self.failed_dir):
+            os.makedirs(directory, exist_ok=True)
+        unfinished = (PART_SUFFIX, PART_SUFFIX + docx_writer.TEMP_SUFFIX)
+        for name in os.listdir(self.outbox):
+            if name.startswith(".") and name.endswith(unfinished):
+                try:
+                    os.remove(os.path.join(self.outbox, name))
+                    log(f"🧹 Removed unfinished output {name}")
+                except OSError as e:
+                    log(f"⚠️ Could not remove unfinished output {name}: {e}")
+        waiting = [name for name in os.listdir(self.inbox)
+                   if is_candidate(name) and os.path.isfile(os.path.join(self.inbox, name))]
+        if waiting:
+            log(f"📥 {len(waiting)} PDF(s) already waiting in the inbox")
+
+    # --- scanning ---
+
+    def scan(self):
+        """Inbox PDFs that are completely written and not yet converting
+
+        Returns (ready, unsettled): unsettled files are still changing or
+        have not been stable for settle_seconds yet.
+        """
+        now = time.monotonic()
+        ready, unsettled = [], 0
+        present = set()
+        try:
+            names = sorted(os.listdir(self.inbox))
+        except OSError as e:
+            log(f"⚠️ Cannot list {self.inbox}: {e}")
+            return [], 0
+        for name in names:
+            path = os.path.join(self.inbox, name)
+            if not is_candidate(name) or path in self.in_flight:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # gone again
+            if not os.path.isfile(path):
+                continue
+            present.add(path)
+            signature = (st.st_size, st.st_mtime_ns)
+            seen = self._seen.get(path)
+            if seen is None or seen[0] != signature:
+                self._seen[path] = (signature, now)
+                unsettled += 1
+            elif now - seen[1] < self.settle_seconds or not st.st_size or not self._readable(path):
+                unsettled += 1
+            else:
+                ready.append(path)
+        # Forget files that were removed before they settled
+        self._seen = {p: v for p, v in self._seen.items() if p in present}
+        return ready, unsettled
+
+    @staticmethod
+    def _readable(path):
+        """False while another program holds the file locked (Windows copies do)"""
+        try:
+            with open(path, "rb"):
+                return True
+        except OSError:
+            return False
+
+    # --- converting ---
+
+    def submit(self, pdf_path):
+        name = os.path.splitext(os.path.basename(pdf_path))[0]
+        part_path = unique_path(self.outbox, f".{name}{PART_SUFFIX}")
+        # Reserve the name now; the worker overwrites the empty file
+        open(part_path, "wb").close()
+        future = self.pool.submit(cli.convert_job, pdf_path, part_path, self.args.mode, self.options)
+        future.add_done_callback(lambda _: self.wake.set())
+        self.in_flight[pdf_path] = (future, part_path, self.pool)
+        self._seen.pop(pdf_path, None)
+        log(f"🔄 Converting {os.path.basename(pdf_path)}")
+
+    def collect(self):
+        """Move the inputs and outputs of finished conversions into place"""
+        for pdf_path, (future, part_path, pool) in list(self.in_flight.items()):
+            if not future.done():
+                continue
+            del self.in_flight[pdf_path]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (crash or out of memory); the pool is unusable now
+                result = {"success": False, "error": f"worker process died: {e}"}
+                self._restart_pool(pool)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            if "metrics" in result:
+                cli.record_result(self.args, self.registry, self.json_log, result)
+            if result["success"]:
+                self._succeeded(pdf_path, part_path, result)
+            else:
+                self._failed(pdf_path, part_path, result.get("error") or "Conversion failed")
+
+    def _succeeded(self, pdf_path, part_path, result):
+        try:
+            # Output first: if we stop in between, the PDF is converted twice
+            # rather than its DOCX being lost
+            docx_path = engine.get_output_path(pdf_path, self.outbox)
+            os.replace(part_path, docx_path)
+            shutil.move(pdf_path, unique_path(self.processed_dir, os.path.basename(pdf_path)))
+        except OSError as e:
+            self._failed(pdf_path, part_path, f"Could not move files: {e}")
+            return
+        self.converted += 1
+        log(f"✅ {os.path.basename(pdf_path)} -> {docx_path} "
+            f"({result['pages']} pages, {result['seconds']:.2f} s)")
+
+    def _failed(self, pdf_path, part_path, error):
+        self.failed += 1
+        if os.path.exists(part_path):
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+        try:
+            target = unique_path(self.failed_dir, os.path.basename(pdf_path))
+            shutil.move(pdf_path, target)
+            with open(os.path.splitext(target)[0] + ".error.txt", "w", encoding="utf-8") as f:
+                f.write(f"{error}\n")
+        except OSError as e:
+            log(f"⚠️ Could not move {pdf_path} to {self.failed_dir}: {e}")
+        log(f"❌ {os.path.basename(pdf_path)}: {error}")
+
+    def _start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.args.workers, initializer=cli.init_worker,
+                                        initargs=cli.cache_arguments(self.args))
+
+    def _restart_pool(self, broken):
+        """Replace the broken pool, once however many of its futures failed"""
+        if self.pool is not broken:
+            return  # already replaced
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self._start_pool()
+
+    # --- main loop ---
+
+    def stop(self, *_):
+        """Stop taking new files; conversions already running are finished"""
+        if not self.stopping:
+            log("⏹️ Stopping after the running conversions...")
+        self.stopping = True
+        self.wake.set()
+
+    def run(self, once=False):
+        """Watch and convert until stopped; with once, exit when the inbox is empty"""
+        self.reconcile()
+        observer = start_observer(self.inbox, self.wake)
+        if observer:
+            log(f"👀 Watching {self.inbox} for new PDFs")
+        else:
+            log(f"👀 Watching {self.inbox} (polling every {self.poll_seconds:g} s; "
+                "pip install watchdog for OS notifications)")
+        self._start_pool()
+        try:
+            while True:
+                self.collect()
+                if self.stopping:
+                    if not self.in_flight:
+                        break
+                    unsettled = 0
+                else:
+                    ready, unsettled = self.scan()
+                    for pdf_path in ready[:max(0, self.args.workers - len(self.in_flight))]:
+                        self.submit(pdf_path)
+                    if once and not ready and not unsettled and not self.in_flight:
+                        break
+
+                if unsettled:
+                    timeout = max(0.2, self.settle_seconds / 2)
+                elif observer and not once:
+                    timeout = RESCAN_SECONDS
+                else:
+                    timeout = self.poll_seconds
+                self.wake.wait(timeout)
+                self.wake.clear()
+        finally:
+            if observer:
+                observer.stop()
+            self.pool.shutdown(wait=True)
+            self.collect()
+        log(f"📊 {self.converted} converted, {self.failed} failed")
+        return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Watch a folder and convert every PDF dropped into it to DOCX.")
+    parser.add_argument("inbox", help="directory to watch for PDF files")
+    parser.add_argument("outbox", help="directory the DOCX files are written to")
+    parser.add_argument("--processed-dir",
+                        help="where converted PDFs are moved (default: INBOX/processed)")
+    parser.add_argument("--failed-dir",
+                        help="where PDFs that could not be converted are moved (default: INBOX/failed)")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is converted "
+                             "(default: %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=POLL_SECONDS,
+                        help="seconds between inbox scans without OS notifications "
+                             "(default: %(default)s)")
+    parser.add_argument("--once", action="store_true",
+                        help="convert what is in the inbox, then exit")
+    cli.add_conversion_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    error = cli.check_conversion_arguments(args)
+    if error:
+        print(f"❌ {error}")
+        return 2
+    if not os.path.isdir(args.inbox):
+        print(f"❌ Inbox {args.inbox} is not a directory")
+        return 2
+    if not engine.find_tesseract():
+        print("⚠️ Tesseract not found: scanned pages will fail to convert")
+
+    daemon = HotFolder(args.inbox, args.outbox,
+                       args.processed_dir or os.path.join(args.inbox, "processed"),
+                       args.failed_dir or os.path.join(args.inbox, "failed"),
+                       args, args.settle, args.poll_interval)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    return daemon.run(once=args.once)
+
+
+if __name__ == "__main__":
+    sys.exit(main())